@@ -1,9 +1,22 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+
 # --- Global Configuration ---
 
 # The current position of the lock. Starts at 50.
 lock_current_state = 50
 # The size of the circular lock (100 possible positions).
 lock_wrap = 100
+# Number of worker processes for the chunked (parallel) mode. 0 runs the serial main().
+parallel_workers = 0
+# Number of instructions handed to a worker at a time in parallel mode.
+parallel_chunk_lines = 1_000_000
+# Run the vectorized NumPy engine (main_bulk) instead of the line-by-line main().
+bulk_mode = False
+# How many bytes of the memory-mapped input the bulk engine handles per block.
+bulk_block_bytes = 1 << 24
 
 
 # --- Movement Functions (Calculating Final State) ---
@@ -54,7 +67,290 @@ def wraps(value, delta):
     return abs(clicks)
 
 
-#
+# --- Chunk Summaries (Parallel Scan) ---
+
+# A chunk of instructions can be replayed from ANY starting position, so we describe it as:
+#   offset:     the net signed distance of the whole chunk,
+#   zeros[s]:   how many times it lands exactly on 0 when started at position s,
+#   wrap_at[s]: how many times it crosses 0 when started at position s.
+# Two summaries merge associatively, so chunks can be summarised independently
+# (in a process pool) and folded together in order afterwards.
+
+
+def parse_rotation(line):
+    """
+    Turns a line like "R18" or "L39" into a signed distance.
+    Returns None for blank or malformed lines.
+    """
+    line = line.strip()
+    if not line:
+        return None
+
+    direction = line[0].upper()
+    try:
+        n = int(line[1:])
+    except ValueError:
+        print(f"Skipping malformed line: {line} (non-integer rotation)")
+        return None
+
+    return n if direction == "R" else -n
+
+
+def summarize_chunk(lines):
+    """
+    Builds the (offset, zeros, wrap_at) summary of a list of instruction lines.
+    Runs in O(len(lines) + lock_wrap), independent of the starting position.
+    """
+    zeros = [0] * lock_wrap
+    # Difference array: +1 at the start of a window of starting positions, -1 after it.
+    extra = [0] * (lock_wrap + 1)
+    full_wraps = 0
+    offset = 0
+
+    for line in lines:
+        delta = parse_rotation(line)
+        if delta is None:
+            continue
+
+        # Every full turn crosses 0 exactly once, whatever the starting position.
+        full_wraps += abs(delta) // lock_wrap
+        r = abs(delta) % lock_wrap
+
+        # The remaining r clicks cross 0 only for some positions x before this step:
+        #   Right: x in [lock_wrap - r, lock_wrap - 1]  (x + r reaches lock_wrap)
+        #   Left:  x in [1, r]                          (x - r reaches 0)
+        # Since x = (s + offset) % lock_wrap, shift the window back by the offset.
+        if r:
+            first = lock_wrap - r if delta > 0 else 1
+            first = (first - offset) % lock_wrap
+            last = first + r
+            if last <= lock_wrap:
+                extra[first] += 1
+                extra[last] -= 1
+            else:
+                # The window wraps around the end of the dial.
+                extra[first] += 1
+                extra[lock_wrap] -= 1
+                extra[0] += 1
+                extra[last - lock_wrap] -= 1
+
+        offset += delta
+
+        # Landing on 0 after this step happens only when s == -offset (mod lock_wrap).
+        zeros[-offset % lock_wrap] += 1
+
+    wrap_at = []
+    running = full_wraps
+    for s in range(lock_wrap):
+        running += extra[s]
+        wrap_at.append(running)
+
+    return offset, zeros, wrap_at
+
+
+def combine(first, second):
+    """
+    Merges the summaries of two consecutive chunks into one.
+    The second chunk starts wherever the first one left off.
+    """
+    offset_a, zeros_a, wraps_a = first
+    offset_b, zeros_b, wraps_b = second
+
+    zeros = []
+    wrap_at = []
+    for s in range(lock_wrap):
+        t = (s + offset_a) % lock_wrap
+        zeros.append(zeros_a[s] + zeros_b[t])
+        wrap_at.append(wraps_a[s] + wraps_b[t])
+
+    return offset_a + offset_b, zeros, wrap_at
+
+
+def read_chunks(t, size):
+    """Yields lists of at most `size` lines from the open file `t`."""
+    chunk = []
+    for line in t:
+        chunk.append(line)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def main_parallel(workers=None):
+    """
+    Same answers as main(), but each chunk of instructions is summarised in a worker
+    process and the summaries are folded together in order.
+    """
+    # Default to the configured worker count, or one worker per core.
+    workers = workers or parallel_workers or os.cpu_count()
+
+    # The identity summary: no movement, no landings, no wraps.
+    total = (0, [0] * lock_wrap, [0] * lock_wrap)
+
+    try:
+        with open("input-2025.txt") as t, ProcessPoolExecutor(workers) as pool:
+            # Keep a bounded number of chunks in flight so huge logs are not read into
+            # memory all at once. Results are combined in file order.
+            pending = deque()
+            for chunk in read_chunks(t, parallel_chunk_lines):
+                pending.append(pool.submit(summarize_chunk, chunk))
+                if len(pending) > 2 * workers:
+                    total = combine(total, pending.popleft().result())
+            while pending:
+                total = combine(total, pending.popleft().result())
+
+    except FileNotFoundError:
+        print(
+            "\nError: 'input.txt' not found."
+        )
+        return
+
+    _, zeros, wrap_at = total
+    print(f"Part 1 Answer: {zeros[lock_current_state]}")
+    print(f"Part 2 Answer: {wrap_at[lock_current_state]}")
+
+
+# --- Bulk Mode (Vectorized NumPy Engine) ---
+
+# Well-formed lines ("R18", "L39") are parsed straight from the memory-mapped bytes.
+# Distances are capped at 15 digits so every intermediate value fits in int64.
+BULK_MAX_DIGITS = 15
+NEWLINE, CR, ZERO = ord("\n"), ord("\r"), ord("0")
+
+
+def parse_block(block):
+    """
+    Turns a block of raw bytes (whole lines only) into an int64 array of signed distances.
+    Lines that are not a single letter followed by digits go through parse_rotation(),
+    which keeps the usual malformed-line skipping.
+    """
+    import numpy as np
+
+    # Line boundaries. int32 offsets are plenty for one block and halve the per-line arrays.
+    newlines = np.flatnonzero(block == NEWLINE).astype(np.int32)
+    starts = np.concatenate(([0], newlines + 1)).astype(np.int32)
+    ends = np.concatenate((newlines, [len(block)])).astype(np.int32)
+    del newlines
+
+    # Drop Windows line endings.
+    has_cr = ends > starts
+    has_cr[has_cr] = block[ends[has_cr] - 1] == CR
+    ends -= has_cr
+
+    # A trailing newline leaves one empty line behind; it starts past the block.
+    if len(starts) and starts[-1] >= len(block):
+        starts, ends = starts[:-1], ends[:-1]
+
+    # Fast path: a direction letter followed by 1..BULK_MAX_DIGITS digits.
+    lengths = ends - starts
+    fast = (lengths >= 2) & (lengths <= BULK_MAX_DIGITS + 1)
+    head = block[starts]
+    lower = head | 0x20  # The direction must be an ASCII letter.
+    fast &= (lower >= ord("a")) & (lower <= ord("z"))
+
+    # Build every number a digit column at a time (value = value * 10 + digit), so the
+    # work arrays hold one entry per line instead of one per byte. A non-digit byte
+    # sends its line to the slow path.
+    lines = np.flatnonzero(fast)
+    number_starts = starts[lines] + 1
+    number_ends = ends[lines]
+    number = np.zeros(len(lines), dtype=np.int64)
+    width = int((number_ends - number_starts).max()) if len(lines) else 0
+    for column in range(width):
+        position = number_starts + column
+        inside = position < number_ends
+        digit = block[np.minimum(position, len(block) - 1)] - ZERO
+        fast[lines[inside & (digit > 9)]] = False
+        np.multiply(number, 10, out=number, where=inside)
+        np.add(number, digit, out=number, where=inside)
+
+    # Signed distances: right turns are positive.
+    deltas = np.zeros(len(starts), dtype=np.int64)
+    deltas[lines] = number
+    del lines, number
+    np.negative(deltas, out=deltas, where=(head & 0xDF) != ord("R"))  # Upper-case ASCII.
+
+    # Slow path for everything else: blank lines, stray whitespace, bad numbers, ...
+    extra_wraps = 0
+    valid = fast.copy()
+    for i in np.flatnonzero(~fast):
+        line = bytes(block[starts[i] : ends[i]]).decode()
+        delta = parse_rotation(line)
+        if delta is None:
+            continue
+        # Huge distances: count the full turns here and keep one turn plus the rest,
+        # which leaves the position and the per-step wrap count unchanged.
+        if abs(delta) > 10**BULK_MAX_DIGITS:
+            extra_wraps += abs(delta) // lock_wrap - 1
+            delta = (abs(delta) % lock_wrap + lock_wrap) * (1 if delta > 0 else -1)
+        deltas[i] = delta
+        valid[i] = True
+
+    return deltas[valid], extra_wraps
+
+
+def main_bulk():
+    """
+    Same answers as main(), computed a block at a time with array expressions:
+    positions come from a cumulative sum modulo lock_wrap, and the per-step wraps()
+    floor divisions are evaluated for the whole block at once.
+    """
+    import numpy as np
+
+    try:
+        if os.path.getsize("input-2025.txt") == 0:
+            data = np.zeros(0, dtype=np.uint8)
+        else:
+            data = np.memmap("input-2025.txt", dtype=np.uint8, mode="r")
+    except FileNotFoundError:
+        print(
+            "\nError: 'input.txt' not found."
+        )
+        return
+
+    state = lock_current_state
+    zero_counter = 0
+    wrap_counter = 0
+
+    start = 0
+    while start < len(data):
+        # Cut each block just after a newline so no line is split between blocks.
+        stop = min(start + bulk_block_bytes, len(data))
+        if stop < len(data):
+            cut = np.flatnonzero(data[start:stop] == NEWLINE)
+            if len(cut):
+                stop = start + cut[-1] + 1
+            else:
+                # One line longer than a block: take all of it (or the rest of the file
+                # when that line has no trailing newline).
+                rest = np.flatnonzero(data[start:] == NEWLINE)
+                stop = start + rest[0] + 1 if len(rest) else len(data)
+
+        deltas, extra_wraps = parse_block(np.asarray(data[start:stop]))
+        start = stop
+        if not len(deltas):
+            wrap_counter += extra_wraps
+            continue
+
+        # Positions after every step. Summing the reduced steps keeps the sums small.
+        positions = (state + np.cumsum(deltas % lock_wrap)) % lock_wrap
+        before = np.concatenate(([state], positions[:-1]))
+
+        # wraps() for every step at once (see wraps() for the boundary reasoning).
+        tmp = before + deltas
+        right = tmp // lock_wrap - before // lock_wrap
+        left = (before - 1) // lock_wrap - (tmp - 1) // lock_wrap
+        clicks = np.abs(np.where(deltas > 0, right, left))
+
+        zero_counter += int(np.count_nonzero(positions == 0))
+        wrap_counter += int(clicks.sum()) + extra_wraps
+        state = int(positions[-1])
+
+    print(f"Part 1 Answer: {zero_counter}")
+    print(f"Part 2 Answer: {wrap_counter}")
+
 
 # --- Main Program Logic ---
 
@@ -125,4 +421,9 @@ def main():
 
 # Standard Python entry point: ensures main() runs when the script is executed directly.
 if __name__ == "__main__":
-    main()
+    if parallel_workers:
+        main_parallel()
+    elif bulk_mode:
+        main_bulk()
+    else:
+        main()
@@ -1,30 +1,253 @@
+import mmap
+import os
 import re
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
 # The 're' module is imported for powerful, optimized regular expression processing.
 
 
-# --- Regular Expression Setup ---
+# --- Closed-Form Setup ---
 
-# Part 1 Pattern: Check for numbers made of EXACTLY two identical halves (e.g., 1212, 55).
-# r'^(\d+)\1$' breakdown:
-# ^          : Start of the string.
-# (\d+)      : Capture Group 1: Match one or more digits.
-# \1         : Match the exact content captured by Group 1.
-# $          : End of the string.
-# The re.compile() function pre-processes the pattern string into a pattern object,
-# which makes repeated searching inside the loop faster.
-pattern_a = re.compile(r"^(\d+)\1$")
+# Every "repeated block" number has a very rigid shape. If the whole number has L digits
+# and is made of a block of b digits repeated L/b times, then:
+#   number = block * (10^(L-b) + 10^(L-2b) + ... + 10^0) = block * (10^L - 1) / (10^b - 1)
+# e.g. 123123 = 123 * 1001, and 555 = 5 * 111.
+# So instead of scanning every integer in a range, we can walk the few (L, b) shapes and
+# count/sum the matching blocks with plain arithmetic.
 
-# Part 2 Pattern: Check for numbers made of a repeating pattern (e.g., 1212, 111, 123123123).
-# r'^(\d+)\1+$' breakdown:
-# ^          : Start of the string.
-# (\d+)      : Capture Group 1: Match one or more digits (the base repeating block).
-# \1+        : Match the exact content of Group 1 *one or more* additional times.
-# $          : End of the string.
-pattern_b = re.compile(r"^(\d+)\1+$")
+
+def repeat_multiplier(length, block):
+    """
+    Returns the multiplier that turns a `block`-digit block into a `length`-digit repeat.
+    e.g. repeat_multiplier(6, 3) = 1001, repeat_multiplier(4, 1) = 1111.
+    """
+    return (10**length - 1) // (10**block - 1)
+
+
+def block_sum(lo, hi, length, block):
+    """
+    Sums every `length`-digit number in [lo, hi] that is a `block`-digit block repeated.
+    """
+    mult = repeat_multiplier(length, block)
+
+    # Valid blocks have exactly `block` digits (no leading zero)...
+    first = 10 ** (block - 1)
+    last = 10**block - 1
+
+    # ...and must land inside [lo, hi] once multiplied.
+    # -(-lo // mult) is ceiling division without floats.
+    first = max(first, -(-lo // mult))
+    last = min(last, hi // mult)
+
+    if first > last:
+        return 0
+
+    # Arithmetic series: mult * (first + first+1 + ... + last)
+    return mult * (first + last) * (last - first + 1) // 2
+
+
+def prime_factors(n):
+    """Returns the distinct prime factors of a (small) digit length."""
+    factors = []
+    p = 2
+    while p * p <= n:
+        if n % p == 0:
+            factors.append(p)
+            while n % p == 0:
+                n //= p
+        p += 1
+    if n > 1:
+        factors.append(n)
+    return factors
+
+
+def repeated_sums(lo, hi):
+    """
+    Returns (a, b) for the inclusive range [lo, hi]:
+      a: sum of numbers made of EXACTLY two identical halves (e.g. 1212, 55).
+      b: sum of numbers made of ANY repeating block (e.g. 1212, 111, 123123123).
+    The work depends only on the number of digit lengths, not on hi - lo.
+    """
+    a = 0
+    b = 0
+
+    for length in range(len(str(lo)), len(str(hi)) + 1):
+        # Only look at the slice of [lo, hi] that has exactly `length` digits.
+        sub_lo = max(lo, 10 ** (length - 1))
+        sub_hi = min(hi, 10**length - 1)
+        if sub_lo > sub_hi:
+            continue
+
+        # Part 1: the block is exactly half of the number.
+        if length % 2 == 0:
+            a += block_sum(sub_lo, sub_hi, length, length // 2)
+
+        # Part 2: a number repeating with block b also repeats with any block that is a
+        # multiple of b (and divides the length), so summing over every block size would
+        # double count. Every repeat is covered by some block L/p with p prime, and the
+        # overlap of two such shapes is the shape of their gcd block, so we use
+        # inclusion-exclusion over subsets of the prime factors of L.
+        primes = prime_factors(length)
+        for subset in range(1, 1 << len(primes)):
+            divisor = 1
+            bits = 0
+            for i, p in enumerate(primes):
+                if subset >> i & 1:
+                    divisor *= p
+                    bits += 1
+            sign = 1 if bits % 2 else -1
+            b += sign * block_sum(sub_lo, sub_hi, length, length // divisor)
+
+    return a, b
+
+
+# --- Prefix-Sum Index (Batch Queries) ---
+
+# When thousands of ranges arrive at once, it pays to list every repeated number up to some
+# digit limit ONCE, sorted, together with running totals. Each range is then just two
+# binary searches and a subtraction.
+# Totals are stored as unsigned 64-bit ints; 12 digits is the largest limit whose grand
+# total still fits (every repeated number below 10^12 sums to roughly 5 * 10^17).
+MAX_INDEX_DIGITS = 12
+
+# Binary file layout: magic, digit limit, entry count, then three native 'Q' arrays
+# (values, Part 1 prefix sums, Part 2 prefix sums).
+INDEX_HEADER = struct.Struct("<8sQQ")
+INDEX_MAGIC = b"AOC02IDX"
+
+
+class RepeatIndex:
+    """
+    Sorted, array-backed list of every repeated-block number below 10^digits, with
+    prefix sums for both the "two halves" (Part 1) and "any repeat" (Part 2) rules.
+    """
+
+    def __init__(self, digits, values, prefix_a, prefix_b):
+        self.digits = digits
+        self.limit = 10**digits - 1
+        self.values = values
+        # prefix_x[i] is the total of the first i values (prefix_x[0] == 0).
+        self.prefix_a = prefix_a
+        self.prefix_b = prefix_b
+
+    @classmethod
+    def build(cls, digits=MAX_INDEX_DIGITS):
+        """Enumerates every repeated number with up to `digits` digits."""
+        if not 1 <= digits <= MAX_INDEX_DIGITS:
+            raise ValueError(f"digits must be between 1 and {MAX_INDEX_DIGITS}")
+
+        # Map each repeated number to whether it is made of exactly two halves.
+        # A number like 1111 shows up for several block sizes, the dict deduplicates it.
+        found = {}
+        for length in range(2, digits + 1):
+            for block in range(1, length // 2 + 1):
+                if length % block:
+                    continue
+                mult = repeat_multiplier(length, block)
+                is_half = block * 2 == length
+                for value in range(10 ** (block - 1) * mult, 10**block * mult, mult):
+                    found[value] = found.get(value, False) or is_half
+
+        values = array("Q", sorted(found))
+        prefix_a = array("Q", [0])
+        prefix_b = array("Q", [0])
+        total_a = 0
+        total_b = 0
+        for value in values:
+            if found[value]:
+                total_a += value
+            total_b += value
+            prefix_a.append(total_a)
+            prefix_b.append(total_b)
+
+        return cls(digits, values, prefix_a, prefix_b)
+
+    def save(self, path):
+        """Writes the index to `path` so later runs can memory-map it."""
+        with open(path, "wb") as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, self.digits, len(self.values)))
+            self.values.tofile(f)
+            self.prefix_a.tofile(f)
+            self.prefix_b.tofile(f)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Memory-maps an index written by save(). Nothing is parsed or copied: the arrays
+        are read-only views straight into the page cache.
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, digits, count = INDEX_HEADER.unpack_from(mapped)
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"{path} is not a day-02 index file")
+
+        view = memoryview(mapped)
+        width = array("Q").itemsize
+        start = INDEX_HEADER.size
+        values = view[start : start + count * width].cast("Q")
+        start += count * width
+        prefix_a = view[start : start + (count + 1) * width].cast("Q")
+        start += (count + 1) * width
+        prefix_b = view[start : start + (count + 1) * width].cast("Q")
+
+        return cls(digits, values, prefix_a, prefix_b)
+
+    @classmethod
+    def open(cls, path, digits=MAX_INDEX_DIGITS):
+        """Loads the index from `path`, building and saving it first if needed."""
+        if os.path.exists(path):
+            index = cls.load(path)
+            if index.digits == digits:
+                return index
+        index = cls.build(digits)
+        index.save(path)
+        return cls.load(path)
+
+    def query(self, lo, hi):
+        """
+        Returns (a, b) for the inclusive range [lo, hi] in O(log N).
+        Any part of the range above the index limit falls back to the closed form.
+        """
+        a = 0
+        b = 0
+
+        # A reversed range is empty, just like in repeated_sums().
+        if lo > hi:
+            return a, b
+
+        if lo <= self.limit:
+            i = bisect_left(self.values, lo)
+            j = bisect_right(self.values, min(hi, self.limit))
+            a = self.prefix_a[j] - self.prefix_a[i]
+            b = self.prefix_b[j] - self.prefix_b[i]
+
+        if hi > self.limit:
+            high_a, high_b = repeated_sums(max(lo, self.limit + 1), hi)
+            a += high_a
+            b += high_b
+
+        return a, b
+
+    def batch(self, ranges):
+        """Returns the (a, b) totals over any number of (lo, hi) ranges."""
+        a = 0
+        b = 0
+        for lo, hi in ranges:
+            range_a, range_b = self.query(lo, hi)
+            a += range_a
+            b += range_b
+        return a, b
 
 
 # --- Initialization ---
 
+# Set this to a file path (e.g. "inputs/index-02-2025.bin") to answer the ranges from the
+# prefix-sum index. The first run builds and saves it, later runs just memory-map it.
+INDEX_PATH = None
+
 # 'a' sums the invalid numbers for the Part 1 rule (exactly two halves).
 a = 0
 # 'b' sums the invalid numbers for the Part 2 rule (any repeating pattern, which includes Part 1).
@@ -41,28 +264,18 @@ file_content = open("inputs/input-02-2025.txt").read()
 # -          : Matches the literal dash separator.
 # (\d+)      : Capture Group 2: Matches and captures the ending number (hi).
 # The result is a list of tuples: [('1061119', '1154492'), ('3', '23'), ...]
-# The loop iterates through these tuples.
-for lo, hi in re.findall(r"(\d+)-(\d+)", file_content):
-    # Convert the string boundaries to integers once per range.
-    start = int(lo)
-    end = int(hi)
-
-    # --- Inner Loop: Processing Each Number ---
-
-    # Iterate over every integer 'i' in the defined range (inclusive).
-    for i in range(start, end + 1):
-        # Convert the current integer 'i' to its string representation only once.
-        s = str(i)
-
-        # Check Part 1 rule using the pre-compiled pattern_a and re.search.
-        # re.search is efficient because it stops immediately upon finding a match.
-        if pattern_a.search(s):
-            a += i
-
-        # Check Part 2 rule using the pre-compiled pattern_b.
-        # This check is independent of Part 1, summing numbers that match *any* repeating pattern.
-        if pattern_b.search(s):
-            b += i
+# Convert the string boundaries to integers once per range.
+ranges = [(int(lo), int(hi)) for lo, hi in re.findall(r"(\d+)-(\d+)", file_content)]
+
+if INDEX_PATH:
+    # Batch mode: two binary searches per range against the prebuilt index.
+    a, b = RepeatIndex.open(INDEX_PATH).batch(ranges)
+else:
+    # Let the closed-form enumerator handle each range directly.
+    for lo, hi in ranges:
+        range_a, range_b = repeated_sums(lo, hi)
+        a += range_a
+        b += range_b
 
 # --- Output ---
 # Print the final sums for both parts of the problem.
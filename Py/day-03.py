@@ -1,63 +1,145 @@
-# --- Input Reading ---
+# --- Configuration ---
 
-# Read the data.
-# 1. open('input-03-2025.txt'): Opens the specified file for reading.
-# 2. .read(): Reads the entire content of the file as a single string.
-# 3. .split(): Splits the string content into a list of substrings
-#    based on whitespace (spaces, newlines, tabs).
-#    Each element in 'data' is expected to be a string of digits.
-data = open("input-03-2025.txt").read().split()
+# Set to True to solve every bank at once as a NumPy digit matrix (equal-length banks only).
+BATCH_MODE = False
 
-# --- Core Function: Greedy Subsequence Selection ---
+# --- Core Function: Greedy Subsequence Selection (Monotonic Stack) ---
 
 
-# Define a function 'maxj' that implements a greedy algorithm.
-# It finds the largest possible integer that can be formed by
-# selecting 'k' digits from the input string 's' while preserving their original relative order.
+# Define a function 'maxj_multi' that finds, for every k in 'ks', the largest possible
+# integer that can be formed by selecting 'k' digits from the input string 's'
+# while preserving their original relative order.
+# It makes a single pass over 's' and keeps one stack of chosen digits per k.
+def maxj_multi(s, ks):
+    n = len(s)
+
+    # One stack (a list of chosen digits) per requested length.
+    stacks = [[] for _ in ks]
+
+    for i, ch in enumerate(s):
+        # 'left' is how many characters (including this one) are still unread.
+        left = n - i
+
+        for stack, k in zip(stacks, ks):
+            # While the last chosen digit is smaller than the current one, and dropping it
+            # still leaves enough characters to fill all k slots, drop it.
+            # Each digit is pushed and popped at most once, so this is O(n) per k.
+            while stack and stack[-1] < ch and len(stack) - 1 + left >= k:
+                stack.pop()
+
+            # Keep the digit only if there is still room for it.
+            if len(stack) < k:
+                stack.append(ch)
+
+    # Join the chosen digits once (no quadratic string building) and convert to integers.
+    return [int("".join(stack)) for stack in stacks]
+
+
+# Define a function 'maxj' that implements the greedy algorithm for a single 'k'.
 def maxj(s, k):
-    # 'r' will store the selected digits, which will form the maximized number.
-    r = ""
-
-    # The loop iterates 'k' times, once for each digit we need to select for the result 'r'.
-    # 'skip' tracks how many characters *must* be left at the end of the original string 's'
-    # to ensure that exactly 'k' characters can still be chosen.
-    # The loop runs for skip = k-1, k-2, ..., 1, 0.
-    # Example: If k=5, the loop starts with skip=4 (meaning 4 more digits must be chosen
-    # from the rest of the string, so we must leave at least 4 chars unexamined).
-    for skip in range(k - 1, -1, -1):
-        # 1. Define the search range: s[:len(s)-skip]
-        # This is the segment (a slice) of the current string 's' from which we can safely choose the next digit.
-        # We must ensure that after choosing this digit, there are still at least 'skip'
-        # characters remaining in 's' (i.e., s[j+1:]) to select the remaining 'skip' digits.
-        search_range = s[: len(s) - skip]
-
-        # 2. Greedy Choice: Find the largest available digit in the search range.
-        max_char = max(search_range)
-
-        # 3. Find the index 'j' of the *first* occurrence of this maximum digit
-        #    within the safe search range (s).
-        j = s.index(max_char)
-
-        # 4. Update the result and the remaining string:
-        # Append the chosen maximum digit (s[j]) to the result string 'r'.
-        r = r + s[j]
-
-        # Update the string 's' to start *after* the chosen digit.
-        # s[j+1:] ensures that the relative order of the remaining digits is maintained.
-        s = s[j + 1 :]
-
-    # After the loop finishes (i.e., 'k' digits have been selected),
-    # convert the resulting string 'r' into an integer and return it.
-    return int(r)
+    return maxj_multi(s, (k,))[0]
+
+
+# --- Batch Mode: All Banks as One Digit Matrix ---
+
+
+# Load equal-length banks straight from the file bytes into a (banks x digits) uint8 matrix.
+def load_banks(path):
+    import numpy as np
+
+    raw = np.fromfile(path, dtype=np.uint8)
+
+    # Drop trailing whitespace and Windows line endings.
+    raw = raw[raw != ord("\r")]
+    end = len(raw)
+    while end and raw[end - 1] in b" \n\t":
+        end -= 1
+    raw = raw[:end]
+    if not len(raw):
+        return np.zeros((0, 0), dtype=np.uint8)
+
+    # Every row is 'width' digits plus one newline (the last row has no newline).
+    newlines = np.flatnonzero(raw == ord("\n"))
+    width = newlines[0] if len(newlines) else len(raw)
+    rows = len(newlines) + 1
+    if len(raw) != rows * (width + 1) - 1 or np.any(newlines % (width + 1) != width):
+        raise ValueError(f"{path}: banks must all have the same length")
+
+    # Append the missing final newline so the bytes reshape into rows, then cut it off.
+    matrix = np.append(raw, ord("\n")).reshape(rows, width + 1)[:, :width]
+    return matrix - ord("0")
+
+
+# Define a function 'maxj_batch' that runs the same greedy selection as the original 'maxj'
+# on every row of 'banks' at once, for every k in 'ks'.
+# Returns (per-bank results for each k, sum for each k).
+def maxj_batch(banks, ks):
+    import numpy as np
+
+    rows, n = banks.shape
+    cols = np.arange(n)
+    row_ids = np.arange(rows)
+
+    # Mask value below every digit, used to hide columns outside the search window.
+    blocked = np.int8(-1)
+    digits = banks.astype(np.int8)
+
+    results = []
+    for k in ks:
+        # No banks at all: nothing to pick, and argmax would fail on the empty matrix.
+        if rows == 0:
+            results.append(np.zeros(0, dtype=np.int64))
+            continue
+
+        # 'pos' is where each row's search window starts (right after the last pick).
+        pos = np.zeros(rows, dtype=np.intp)
+        picked = np.empty((rows, k), dtype=np.int64)
+
+        for step, skip in enumerate(range(k - 1, -1, -1)):
+            # The window is [pos, n - skip): we must leave 'skip' digits for later picks.
+            window = (cols >= pos[:, None]) & (cols < n - skip)
+            # argmax returns the FIRST maximum, just like s.index(max(...)).
+            j = np.argmax(np.where(window, digits, blocked), axis=1)
+            picked[:, step] = banks[row_ids, j]
+            pos = j + 1
+
+        # Turn each row of picked digits into a number.
+        if k <= 18:
+            values = picked @ (10 ** np.arange(k - 1, -1, -1, dtype=np.int64))
+        else:
+            # Too many digits for int64: fall back to exact Python integers.
+            values = np.array(
+                [int("".join(map(str, row))) for row in picked], dtype=object
+            )
+        results.append(values)
+
+    sums = [sum(int(v) for v in values) for values in results]
+    return results, sums
 
 
 # --- Calculation and Output ---
 
-# Uses a generator expression to calculate maxj(s, 2) for every string 's' in the 'data' list,
-# and then sums all the resulting integers.
-# This finds the sum of the largest 2-digit numbers that can be formed from each input string.
-print(sum(maxj(s, 2) for s in data))
+if BATCH_MODE:
+    # Load every bank into one digit matrix and solve both k values for all rows at once.
+    _, (p1, p2) = maxj_batch(load_banks("input-03-2025.txt"), (2, 12))
+else:
+    # Read the data.
+    # 1. open('input-03-2025.txt'): Opens the specified file for reading.
+    # 2. .read(): Reads the entire content of the file as a single string.
+    # 3. .split(): Splits the string content into a list of substrings
+    #    based on whitespace (spaces, newlines, tabs).
+    #    Each element in 'data' is expected to be a string of digits.
+    data = open("input-03-2025.txt").read().split()
+
+    # Select the largest 2-digit and 12-digit numbers from every string in a single pass
+    # each, and add them to the running totals (both stay 0 for an empty file).
+    p1 = 0
+    p2 = 0
+    for s in data:
+        best2, best12 = maxj_multi(s, (2, 12))
+        p1 += best2
+        p2 += best12
 
-# Performs the same operation but selects the largest 12-digit number from each string.
-# This finds the sum of the largest 12-digit numbers that can be formed from each input string.
-print(sum(maxj(s, 12) for s in data))
+# The sums of the largest 2-digit and 12-digit numbers that can be formed from each string.
+print(p1)
+print(p2)
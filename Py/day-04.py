@@ -1,14 +1,30 @@
+import mmap
+import os
+import shutil
 import sys
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
-# Read all lines from standard input, strip whitespace, and turn each line into a list of characters
-# This creates a 2D grid: grid[row][column]
-grid = [list(line) for line in sys.stdin.read().strip().splitlines()]
-ROWS, COLS = len(grid), len(grid[0])
+# Set to True to run the bit-packed (bitboard) engine instead of the worklist peeling.
+BITBOARD_MODE = False
+
+# Set to a grid file path to process it in horizontal bands from a memory map instead of
+# reading stdin. STREAM_MEMORY_LIMIT caps the bytes all bands in memory may use together,
+# STREAM_WORKERS sets the process pool size for the first round (None = one per core).
+# The Part 2 scratch copy of the grid goes to STREAM_SCRATCH_DIR (None = next to the input).
+STREAM_PATH = None
+STREAM_MEMORY_LIMIT = 64 << 20
+STREAM_WORKERS = None
+STREAM_SCRATCH_DIR = None
 
 # These represent the 8 neighbors (Up, Down, Left, Right, and 4 Diagonals)
 # Format: (change_in_row, change_in_col)
 NEIGHBORS_8 = [(-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1)]
 
+# A cell with fewer than this many '@' neighbors gets removed.
+THRESHOLD = 4
+
 
 def count_active_neighbors(r, c):
     """Counts how many '@' symbols surround the cell at grid[r][c]."""
@@ -21,36 +37,294 @@ def count_active_neighbors(r, c):
     return count
 
 
-# MAIN SIMULATION LOOP
-first_pass_count = 0
-total_removed = 0
-is_first_iteration = True
+# MAIN SIMULATION: WORKLIST PEELING
+# Instead of rescanning the whole grid every round, we count every cell's neighbors ONCE
+# and keep a queue of cells that are below the threshold. Removing a cell only changes the
+# counts of its eight neighbors, so only those can newly fall below the threshold.
+# The cells that survive are the same no matter which order we remove them in,
+# so the Part 2 total matches the round-by-round simulation. Total cost is O(cells).
+def peel_worklist():
+    """Returns (first round removals, total removals) for the global grid."""
+    # neighbor_counts[r][c] holds the live '@' neighbor count of every '@' cell
+    neighbor_counts = [[0] * COLS for _ in range(ROWS)]
+    to_remove = deque()
 
-while True:
-    to_remove = []
-
-    # Scan every cell in the grid
     for r in range(ROWS):
         for c in range(COLS):
-            # We only care about active cells ('@')
             if grid[r][c] == "@":
-                # If a cell has fewer than 4 neighbors, it's marked for removal
-                if count_active_neighbors(r, c) < 4:
+                neighbor_counts[r][c] = count_active_neighbors(r, c)
+                # If a cell has fewer than 4 neighbors, it's queued for removal
+                if neighbor_counts[r][c] < THRESHOLD:
                     to_remove.append((r, c))
 
     # Part 1 logic: How many would be removed in the very first round?
-    if is_first_iteration:
-        print(f"Part 1 (Valids): {len(to_remove)}")
-        is_first_iteration = False
-
-    # If no cells were marked for removal, the simulation is finished
-    if not to_remove:
-        break
+    # Exactly the cells that start out below the threshold.
+    first_pass_count = len(to_remove)
 
-    # Perform the removals by changing '@' to '.'
-    for r, c in to_remove:
+    total_removed = 0
+    while to_remove:
+        r, c = to_remove.popleft()
+        # Perform the removal by changing '@' to '.'
         grid[r][c] = "."
+        total_removed += 1
+
+        for dr, dc in NEIGHBORS_8:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < ROWS and 0 <= nc < COLS and grid[nr][nc] == "@":
+                neighbor_counts[nr][nc] -= 1
+                # Queue the neighbor only when it FIRST drops below the threshold,
+                # cells already below it are in the queue.
+                if neighbor_counts[nr][nc] == THRESHOLD - 1:
+                    to_remove.append((nr, nc))
+
+    return first_pass_count, total_removed
+
+
+# BITBOARD SIMULATION
+# The whole grid is packed into ONE Python int, 1 bit per cell: cell (r, c) is bit
+# r * stride + c, where stride = COLS + 1. The extra always-zero "guard" column stops
+# left/right shifts from leaking a cell into the next row.
+# A neighbor direction is then just a shift of the whole board:
+#   board << 1 puts the LEFT neighbor's bit on every cell, board >> 1 the RIGHT one,
+#   board << stride the one ABOVE, board >> stride the one BELOW (and combinations).
+# The 8 shifted boards are summed with bit-sliced adders (one int per bit of the count),
+# so a full round is a few dozen big-int operations running in C.
+# Byte table mapping '@' to '1' and every other byte to '0', for int(..., 2) parsing.
+BIT_TABLE = bytes(ord("1") if b == ord("@") else ord("0") for b in range(256))
+
+
+def pack_grid(lines):
+    """Packs the '@' cells of `lines` into a single int. Returns (board, stride)."""
+    stride = max(map(len, lines)) + 1
+    return pack_rows([line.encode() for line in lines], stride), stride
+
+
+def pack_rows(rows, stride):
+    """Packs a list of byte rows into a single int, row r at bit r * stride."""
+    board = 0
+    # Build the board from the bottom row up, so row r ends up at bit r * stride.
+    for row_bytes in reversed(rows):
+        # Reverse the row so column c becomes bit c of the row.
+        row = int(row_bytes[::-1].translate(BIT_TABLE) or b"0", 2)
+        board = (board << stride) | row
+    return board
+
+
+def removable_cells(board, stride):
+    """Returns the board of '@' cells with fewer than THRESHOLD '@' neighbors."""
+    # Bit planes of the neighbor count: count = ones + 2*twos + 4*fours + 8*eights
+    ones = twos = fours = eights = 0
+
+    for shifted in (
+        board << 1,
+        board >> 1,
+        board << stride,
+        board >> stride,
+        board << (stride + 1),
+        board << (stride - 1),
+        board >> (stride - 1),
+        board >> (stride + 1),
+    ):
+        # Ripple-carry add of a single bit into every cell's counter at once
+        carry = ones & shifted
+        ones ^= shifted
+        carry, twos = twos & carry, twos ^ carry
+        carry, fours = fours & carry, fours ^ carry
+        eights |= carry
+
+    # THRESHOLD is 4: fewer than 4 neighbors means neither the 4s nor the 8s bit is set.
+    # Shifted-in bits outside the board are dropped by the final '& board'.
+    return board & ~(fours | eights)
+
+
+def peel_bitboard(lines):
+    """Round-by-round removal on the packed board. Returns (first round, total)."""
+    board, stride = pack_grid(lines)
+
+    first_pass_count = None
+    total_removed = 0
+    while True:
+        to_remove = removable_cells(board, stride)
+        removed = to_remove.bit_count()
+
+        # Part 1 logic: How many would be removed in the very first round?
+        if first_pass_count is None:
+            first_pass_count = removed
+
+        # If no cells were marked for removal, the simulation is finished
+        if not removed:
+            break
+
+        board &= ~to_remove
+        total_removed += removed
+
+    return first_pass_count, total_removed
+
+
+# BANDED (OUT-OF-CORE) SIMULATION
+# For grids too large to hold in memory, the file is memory-mapped and processed in
+# horizontal bands of rows. Each band is packed into a bitboard together with one "halo"
+# row above and below it (copied from the neighboring bands), so every cell in the band
+# sees all 8 of its neighbors.
+#
+# Part 1 only needs the original grid, so bands are independent and run in a process pool.
+#
+# Part 2 peels each band until it is stable, treating the halo rows as fixed. Halo cells
+# that are still alive may be removed later, so a band only ever UNDER-removes, never
+# removes a cell that would survive. Whenever a band's top or bottom row changes, the
+# neighboring band's halo is stale, so that band is marked dirty and peeled again.
+# When no band is dirty we have reached the same fixed point as the in-memory engines.
+# Removals are written back into a temporary copy of the file, so RAM holds one band.
+
+
+def grid_shape(mapped):
+    """Returns (rows, width) of a memory-mapped grid of equal-length, '\n'-ended rows."""
+    size = len(mapped)
+    width = mapped.find(b"\n")
+    if width < 0:
+        width = size
+    rows = size // (width + 1) + (1 if size % (width + 1) == width else 0)
+    if rows * (width + 1) not in (size, size + 1):
+        raise ValueError("Banded mode needs every row to have the same length")
+    return rows, width
+
+
+def read_rows(mapped, width, start, stop):
+    """Returns rows [start, stop) of the memory-mapped grid as a list of bytes."""
+    return mapped[start * (width + 1) : stop * (width + 1)].split(b"\n")[: stop - start]
+
+
+def load_band(mapped, rows, width, start, stop):
+    """
+    Packs rows [start, stop) plus their halo rows. Returns (board, band_mask), where
+    band_mask selects the band's own cells (never the halo).
+    """
+    stride = width + 1
+    top = max(start - 1, 0)
+    bottom = min(stop + 1, rows)
+    board = pack_rows(read_rows(mapped, width, top, bottom), stride)
+
+    row_mask = (1 << width) - 1
+    band_mask = 0
+    for r in range(start - top, stop - top):
+        band_mask |= row_mask << (r * stride)
+    return board, band_mask
+
+
+def first_round_band(path, start, stop):
+    """Worker: counts the band's cells removed in the first round of the original grid."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        rows, width = grid_shape(mapped)
+        board, band_mask = load_band(mapped, rows, width, start, stop)
+    return (removable_cells(board, width + 1) & band_mask).bit_count()
+
+
+def peel_band(mapped, rows, width, start, stop):
+    """
+    Peels rows [start, stop) in place with the halo rows held fixed.
+    Returns (cells removed, top row changed, bottom row changed).
+    """
+    stride = width + 1
+    top = max(start - 1, 0)
+    board, band_mask = load_band(mapped, rows, width, start, stop)
+    original = board
+
+    while True:
+        to_remove = removable_cells(board, stride) & band_mask
+        if not to_remove:
+            break
+        board &= ~to_remove
+
+    removed = original & ~board
+    if not removed:
+        return 0, False, False
+
+    # Write back only the rows that lost cells.
+    row_mask = (1 << width) - 1
+    for r in range(start, stop):
+        shift = (r - top) * stride
+        if (removed >> shift) & row_mask:
+            bits = format((board >> shift) & row_mask, f"0{width}b")[::-1]
+            offset = r * stride
+            mapped[offset : offset + width] = bits.replace("0", ".").replace("1", "@").encode()
+
+    first_row = (removed >> ((start - top) * stride)) & row_mask
+    last_row = (removed >> ((stop - 1 - top) * stride)) & row_mask
+    return removed.bit_count(), bool(first_row), bool(last_row)
+
+
+def split_bands(rows, width, memory_limit):
+    """Splits the grid into (start, stop) row bands that each fit in `memory_limit` bytes."""
+    # A band costs roughly: the raw bytes, their translated copy, and about a dozen
+    # bitboards (1 bit per cell) inside removable_cells(). Budget 4 bytes per cell.
+    band_rows = max(1, memory_limit // (4 * (width + 1)) - 2)
+    return [(start, min(start + band_rows, rows)) for start in range(0, rows, band_rows)]
+
+
+def peel_banded(
+    path,
+    memory_limit=STREAM_MEMORY_LIMIT,
+    workers=STREAM_WORKERS,
+    scratch_dir=STREAM_SCRATCH_DIR,
+):
+    """Banded Part 1 / Part 2 for the grid file at `path`. Returns (first round, total)."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        rows, width = grid_shape(mapped)
+
+    # Part 1: every band on the original grid, in parallel. All workers hold a band at
+    # once, so they share the memory limit.
+    workers = workers or os.cpu_count() or 1
+    bands = split_bands(rows, width, memory_limit // workers)
+    with ProcessPoolExecutor(workers) as pool:
+        counts = pool.map(first_round_band, [path] * len(bands), *zip(*bands))
+        first_pass_count = sum(counts)
+
+    # Part 2: peel a scratch copy of the file band by band until nothing is dirty. Only
+    # one band is loaded at a time. The copy is as big as the grid, so by default it goes
+    # next to the input rather than to a temp directory that may live in RAM.
+    bands = split_bands(rows, width, memory_limit)
+    if scratch_dir is None:
+        scratch_dir = os.path.dirname(os.path.abspath(path))
+    fd, scratch = tempfile.mkstemp(suffix=".grid", dir=scratch_dir)
+    os.close(fd)
+    try:
+        shutil.copyfile(path, scratch)
+        total_removed = 0
+        with open(scratch, "r+b") as f, mmap.mmap(f.fileno(), 0) as mapped:
+            dirty = set(range(len(bands)))
+            while dirty:
+                b = min(dirty)
+                dirty.discard(b)
+                removed, top_changed, bottom_changed = peel_band(
+                    mapped, rows, width, *bands[b]
+                )
+                total_removed += removed
+                # A changed edge row is part of the neighboring band's halo.
+                if top_changed and b > 0:
+                    dirty.add(b - 1)
+                if bottom_changed and b + 1 < len(bands):
+                    dirty.add(b + 1)
+    finally:
+        os.remove(scratch)
+
+    return first_pass_count, total_removed
+
+
+if __name__ == "__main__":
+    if STREAM_PATH:
+        first_pass_count, total_removed = peel_banded(STREAM_PATH)
+    else:
+        # Read all lines from standard input, stripping surrounding whitespace
+        lines = sys.stdin.read().strip().splitlines()
 
-    total_removed += len(to_remove)
+        if BITBOARD_MODE:
+            first_pass_count, total_removed = peel_bitboard(lines)
+        else:
+            # Turn each line into a list of characters
+            # This creates a 2D grid: grid[row][column]
+            grid = [list(line) for line in lines]
+            ROWS, COLS = len(grid), len(grid[0])
+            first_pass_count, total_removed = peel_worklist()
 
-print(f"Part 2 (Total Removed): {total_removed}")
+    print(f"Part 1 (Valids): {first_pass_count}")
+    print(f"Part 2 (Total Removed): {total_removed}")
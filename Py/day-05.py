@@ -1,4 +1,147 @@
+import mmap
+import os
+import struct
 import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+# Set to a file path to keep the merged ranges in a memory-mapped store between runs.
+# New ranges from the input are merged into it, and ingredients are streamed from stdin.
+STORE_PATH = None
+
+# Store file layout: magic, interval count, covered count, then the 'q' starts and stops.
+STORE_HEADER = struct.Struct("<8sQQ")
+STORE_MAGIC = b"AOC05IVS"
+
+
+class IntervalIndex:
+    """
+    The ranges merged into sorted, non-overlapping [start, stop) intervals, stored in two
+    parallel arrays. Membership is a binary search instead of a scan over every range.
+    """
+
+    def __init__(self, starts, stops, covered=None):
+        self.starts = starts
+        self.stops = stops
+        # Part 2 answer, kept up to date by insert() instead of being recomputed.
+        if covered is None:
+            covered = sum(stop - start for start, stop in zip(starts, stops))
+        self.covered = covered
+
+    @classmethod
+    def from_ranges(cls, ranges):
+        """Builds the index from (start, end) pairs, where 'end' is INCLUSIVE."""
+        starts = array("q")
+        stops = array("q")
+
+        # Sorting by the 'start' value allows us to process the ranges from left to right.
+        for start, end in sorted(ranges):
+            # Python-style exclusive stop, so "10-20" covers 10..20.
+            stop = end + 1
+
+            # CASE A: The next range overlaps or touches the current one.
+            # [Current Range]
+            #       [Next Range]
+            if stops and start <= stops[-1]:
+                # Only extend if the next range pushes the boundary further.
+                if stop > stops[-1]:
+                    stops[-1] = stop
+
+            # CASE B: There is a gap between the ranges.
+            # [Current Range]   ...gap...   [Next Range]
+            else:
+                starts.append(start)
+                stops.append(stop)
+
+        return cls(starts, stops)
+
+    def __len__(self):
+        """Number of merged intervals."""
+        return len(self.starts)
+
+    def __contains__(self, value):
+        # The only interval that can hold 'value' is the last one starting at or before it.
+        i = bisect_right(self.starts, value) - 1
+        return i >= 0 and value < self.stops[i]
+
+    def total(self):
+        """How many distinct numbers are covered by all ranges together."""
+        return self.covered
+
+    def insert(self, start, end):
+        """
+        Merges one more (start, end) range, 'end' INCLUSIVE, into the sorted intervals.
+        Only the intervals it overlaps or touches are replaced; nothing is re-sorted.
+        """
+        stop = end + 1
+
+        # A memory-mapped index is read-only, so take a private copy on the first insert.
+        if not isinstance(self.starts, array):
+            self.starts = array("q", self.starts)
+            self.stops = array("q", self.stops)
+
+        # Intervals [i, j) are the ones that overlap or touch [start, stop).
+        i = bisect_left(self.stops, start)
+        j = bisect_right(self.starts, stop)
+
+        if i < j:
+            start = min(start, self.starts[i])
+            stop = max(stop, self.stops[j - 1])
+            self.covered -= sum(self.stops[k] - self.starts[k] for k in range(i, j))
+
+        self.starts[i:j] = array("q", [start])
+        self.stops[i:j] = array("q", [stop])
+        self.covered += stop - start
+
+    def save(self, path):
+        """Writes the intervals to `path` as two int64 arrays (see STORE_HEADER)."""
+        # Write next to the target and swap it in, so a mapped old copy stays valid.
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(STORE_HEADER.pack(STORE_MAGIC, len(self.starts), self.covered))
+            array("q", self.starts).tofile(f)
+            array("q", self.stops).tofile(f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-maps a store written by save(). No parsing or sorting happens here."""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, count, covered = STORE_HEADER.unpack_from(mapped)
+        if magic != STORE_MAGIC:
+            raise ValueError(f"{path} is not a day-05 interval store")
+
+        view = memoryview(mapped)
+        width = array("q").itemsize
+        start = STORE_HEADER.size
+        starts = view[start : start + count * width].cast("q")
+        stops = view[start + count * width : start + 2 * count * width].cast("q")
+        return cls(starts, stops, covered)
+
+    def count_members(self, values):
+        """Counts how many of 'values' fall into any range, one bisect per value."""
+        return sum(1 for v in values if v in self)
+
+    def contains_many(self, values):
+        """
+        Vectorized membership for a whole batch of IDs at once.
+        Returns a NumPy bool array, one entry per value.
+        """
+        import numpy as np
+
+        values = np.asarray(values, dtype=np.int64)
+        if not len(self.starts):
+            return np.zeros(len(values), dtype=bool)
+        starts = np.frombuffer(self.starts, dtype=np.int64)
+        stops = np.frombuffer(self.stops, dtype=np.int64)
+
+        i = np.searchsorted(starts, values, side="right") - 1
+        # Index 0 is a safe placeholder for values before the first interval (i == -1).
+        return (i >= 0) & (values < stops[np.maximum(i, 0)])
+
 
 def run_optimized(task_input):
     """
@@ -9,57 +152,47 @@ def run_optimized(task_input):
     # We split the input into two chunks: the range definitions and the ingredient list.
     raw_ranges, raw_ingredients = task_input.strip().split("\n\n")
 
-    # We convert the strings into Python 'range' objects.
-    # Why? Because 'x in range(start, end)' is mathematically optimized and extremely fast.
-    ranges = []
-    for line in raw_ranges.splitlines():
-        # Example: "10-20" becomes start=10, end=20
-        start, end = map(int, line.split("-"))
-        # Python ranges are exclusive at the end, so we add 1 to include the 'end' number.
-        ranges.append(range(start, end + 1))
+    # Example: "10-20" becomes start=10, end=20
+    ranges = [tuple(map(int, line.split("-"))) for line in raw_ranges.splitlines()]
 
-    # Convert the ingredients chunk into a list of integers.
-    ingredients = [int(i) for i in raw_ingredients.splitlines()]
+    # A single sort + merge gives us an index that answers both parts.
+    index = IntervalIndex.from_ranges(ranges)
 
-    # For every ingredient, check if it exists in ANY of our range objects.
-    # 'any()' stops checking as soon as it finds the first match (short-circuiting).
-    p1 = sum(1 for i in ingredients if any(i in r for r in ranges))
+    # For every ingredient, binary-search the merged intervals.
+    p1 = index.count_members(map(int, raw_ingredients.split()))
     print(f"Part 1: {p1}")
 
-    # To find the total numbers covered without double-counting overlaps, we sort them first.
-    # Sorting by the 'start' value allows us to process the grid from left to right.
-    sorted_ranges = sorted(ranges, key=lambda r: r.start)
-
-    if not sorted_ranges:
-        print("Part 2: 0")
-        return
-
-    # Initialize our tracker with the first range in the sorted list.
-    current_range = sorted_ranges[0]
-    total_count = len(current_range)
-
-    # Loop through the rest of the ranges and compare them to our "current_range"
-    for next_r in sorted_ranges[1:]:
-        # CASE A: The next range overlaps or touches the current one.
-        # [Current Range]
-        #       [Next Range]
-        if next_r.start <= current_range.stop:
-            # Only if the next range pushes the boundary further do we add to the count.
-            if next_r.stop > current_range.stop:
-                # We only add the 'new' territory covered.
-                total_count += next_r.stop - current_range.stop
-                # Update our current reach to the new furthest point.
-                current_range = range(current_range.start, next_r.stop)
-
-        # CASE B: There is a gap between the ranges.
-        # [Current Range]   ...gap...   [Next Range]
-        else:
-            # Since there is no overlap, we add the entire length of the new range.
-            total_count += len(next_r)
-            # This new range now becomes the one to beat!
-            current_range = next_r
+    # The merged intervals never overlap, so their lengths add up without double-counting.
+    print(f"Part 2: {index.total()}")
+
+
+def run_with_store(path, stream):
+    """
+    Same answers as run_optimized(), but the merged ranges live in the store at `path`.
+    Range lines from `stream` are inserted incrementally (and saved), then every
+    ingredient line is checked as it is read, so nothing but the store sits in memory.
+    """
+    if os.path.exists(path):
+        index = IntervalIndex.load(path)
+    else:
+        index = IntervalIndex(array("q"), array("q"), 0)
+
+    # The range definitions come first, up to the blank line.
+    changed = False
+    for line in stream:
+        if not line.strip():
+            break
+        start, end = map(int, line.split("-"))
+        index.insert(start, end)
+        changed = True
 
-    print(f"Part 2: {total_count}")
+    if changed:
+        index.save(path)
+
+    # Then the ingredient list, one ID per line.
+    p1 = sum(1 for line in stream if line.strip() and int(line) in index)
+    print(f"Part 1: {p1}")
+    print(f"Part 2: {index.total()}")
 
 
 # This block only runs if you call this file directly (e.g., python your_file.py)
@@ -67,8 +200,10 @@ if __name__ == "__main__":
     # We read from 'sys.stdin' so you can pipe your input file into the script:
     # Example: python solve.py < input.txt
     try:
-        user_data = sys.stdin.read()
-        if user_data:
+        if STORE_PATH:
+            # Stream straight from stdin against the persistent store.
+            run_with_store(STORE_PATH, sys.stdin)
+        elif user_data := sys.stdin.read():
             run_optimized(user_data)
         else:
             print("Error: No input data detected. Try: python filename.py < input.txt")
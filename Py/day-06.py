@@ -1,7 +1,22 @@
+import mmap
 import sys
 from math import prod
 
 
+# Set to True to memory-map the worksheet from stdin (python day-06.py < input.txt) and
+# solve it column by column with solver_stream() instead of loading it into memory.
+STREAM_MODE = False
+
+# Set to True to solve with the vectorized NumPy engine, solver_numpy().
+NUMPY_MODE = False
+
+SPACE = ord(" ")
+
+# A product of numbers whose log10 values add up to more than this may not fit in int64
+# (int64 tops out around 9.2 * 10^18), so it is recomputed exactly with Python ints.
+INT64_SAFE_DIGITS = 18
+
+
 def solver(task_input):
     """
     Solves both parts using optimized transpose and C-based math functions.
@@ -36,6 +51,9 @@ def solver(task_input):
     # Becomes numbers: 12 and 45
     p2 = 0
     temp_val = 0
+    # True until the current problem has seen its first number. (A running product of 0
+    # can't mark that: a vertical number may itself be 0, e.g. a column of zeros.)
+    first_num = True
     op_idx = 0
     current_op = operators[0]
 
@@ -49,15 +67,17 @@ def solver(task_input):
             # If we found a number, convert and apply the current operator
             num = int(combined_str)
             if current_op == "*":
-                # If temp_val is 0, we start with the first number
-                temp_val = (temp_val * num) if temp_val != 0 else num
+                # The first number starts the product
+                temp_val = num if first_num else temp_val * num
             else:
                 temp_val += num
+            first_num = False
         else:
             # If we hit a space/gap, the current problem is over.
             # Add to total and move to the next operator.
             p2 += temp_val
             temp_val = 0
+            first_num = True
             op_idx += 1
             if op_idx < len(operators):
                 current_op = operators[op_idx]
@@ -68,10 +88,211 @@ def solver(task_input):
     return p1, p2
 
 
+def segment_products(values, starts):
+    """
+    Products of values[starts[i] : starts[i+1]] for every segment i.
+    Uses int64 where it is safe and exact Python ints only for segments that could overflow.
+    """
+    import numpy as np
+
+    products = np.multiply.reduceat(values, starts).astype(object)
+
+    # Estimate every segment's product size from the sum of the logs (zeros give -inf).
+    with np.errstate(divide="ignore"):
+        logs = np.log10(values.astype(np.float64))
+    big = np.flatnonzero(np.add.reduceat(logs, starts) > INT64_SAFE_DIGITS)
+
+    bounds = np.append(starts, len(values))
+    for i in big:
+        products[i] = prod(int(v) for v in values[bounds[i] : bounds[i + 1]])
+    return products
+
+
+def solver_numpy(task_input):
+    """
+    Solves both parts with array operations on a character matrix instead of
+    per-column string joins. Numbers are built as digit-weighted sums.
+    """
+    import numpy as np
+
+    # Split into lines and remove the empty ones
+    data = [line for line in task_input.splitlines() if line.strip()]
+    if not data:
+        return 0, 0
+
+    # Pad every line to the same width and stack them into a (rows x columns) byte matrix
+    width = max(map(len, data))
+    chars = np.frombuffer(
+        "".join(line.ljust(width) for line in data).encode(), dtype=np.uint8
+    ).reshape(len(data), width)
+
+    # The operators (+ or *) are on the very last line, the numbers are above it
+    grid = chars[:-1]
+    ops_row = chars[-1]
+
+    is_digit = grid != SPACE
+    digits = np.where(is_digit, grid - 48, 0).astype(np.int64)
+
+    # Separator columns are all spaces, numbers AND operator line (one reduction)
+    blank = ~is_digit.any(axis=0) & (ops_row == SPACE)
+    # A problem starts at every non-blank column whose left neighbor is blank
+    starts = np.flatnonzero(~blank & np.concatenate(([True], blank[:-1])))
+    if not len(starts):
+        return 0, 0
+
+    # Drop the separator columns so every segment is one contiguous block of columns
+    keep = ~blank
+    digits, is_digit, ops_row = digits[:, keep], is_digit[:, keep], ops_row[keep]
+    starts = np.searchsorted(np.flatnonzero(keep), starts)
+    first_column = np.zeros(digits.shape[1], dtype=np.int64)
+    first_column[starts] = 1
+    segment_of = np.cumsum(first_column) - 1
+
+    # The operator of each problem: '+' (43) sorts above '*' (42) and both above ' ' (32)
+    is_product = np.maximum.reduceat(ops_row, starts) == ord("*")
+
+    powers = 10 ** np.arange(INT64_SAFE_DIGITS + 1, dtype=np.int64)
+
+    # Part 1: numbers are read left to right along each row, inside each problem.
+    # A digit's weight is 10^(digits to its right in the same row and problem).
+    seen = np.cumsum(is_digit, axis=1)
+    seg_end = np.append(starts[1:], digits.shape[1]) - 1
+    right = seen[:, seg_end[segment_of]] - seen
+    below = np.cumsum(is_digit[::-1], axis=0)[::-1] - is_digit
+    if max(right.max(), below.max()) > INT64_SAFE_DIGITS:
+        raise ValueError("solver_numpy() only handles numbers of up to 19 digits")
+    row_numbers = np.add.reduceat(digits * powers[right * is_digit], starts, axis=1)
+    has_number = np.add.reduceat(is_digit, starts, axis=1) > 0
+
+    # Part 2: numbers are read top to bottom along each column.
+    # A digit's weight is 10^(digits below it in the same column).
+    col_numbers = (digits * powers[below * is_digit]).sum(axis=0)
+    has_column = is_digit.any(axis=0)
+
+    # Empty entries must not change the result: 0 for sums, 1 for products
+    p1_sums = np.where(has_number, row_numbers, 0).sum(axis=0)
+    p2_sums = np.add.reduceat(col_numbers, starts)
+
+    p1_prods = np.ones(len(starts), dtype=object)
+    for r in range(row_numbers.shape[0]):
+        p1_prods *= np.where(has_number[r], row_numbers[r], 1).astype(object)
+    p2_prods = segment_products(np.where(has_column, col_numbers, 1), starts)
+
+    p1 = sum(int(v) for v in np.where(is_product, p1_prods, p1_sums.astype(object)))
+    p2 = sum(int(v) for v in np.where(is_product, p2_prods, p2_sums.astype(object)))
+    return p1, p2
+
+
+def row_spans(mapped):
+    """
+    Returns (start, length) of every non-blank row in the mapped worksheet,
+    without copying any row. Trailing '\r' is left out of the length.
+    """
+    spans = []
+    pos = 0
+    size = len(mapped)
+    while pos < size:
+        end = mapped.find(b"\n", pos)
+        if end < 0:
+            end = size
+        length = end - pos
+        if length and mapped[pos + length - 1] == ord("\r"):
+            length -= 1
+        # Skip empty lines, just like solver() does
+        if mapped[pos : pos + length].strip():
+            spans.append((pos, length))
+        pos = end + 1
+    return spans
+
+
+def solver_stream(mapped):
+    """
+    Solves both parts in ONE left-to-right walk over the columns of a memory-mapped
+    worksheet. Each row is read in place through its byte offset, so memory does not
+    grow with the worksheet width: we only keep the running values of the current problem.
+    """
+    spans = row_spans(mapped)
+    if not spans:
+        return 0, 0
+
+    # The operators (+ or *) are on the very last row, the numbers are above it
+    number_rows = spans[:-1]
+    op_start, op_len = spans[-1]
+    width = max(length for _, length in spans)
+
+    p1 = 0
+    p2 = 0
+
+    # Running state of the problem we are currently inside
+    row_values = [0] * len(number_rows)  # Part 1: each row's number, read left to right
+    row_seen = [False] * len(number_rows)
+    col_sum = 0  # Part 2: we don't know the operator until we see it,
+    col_prod = 1  # so keep both the sum and the product of the vertical numbers
+    op = None
+    in_problem = False
+
+    for c in range(width + 1):
+        # One past the last column acts as a final all-space separator
+        blank = True
+        vertical = 0
+        has_digit = False
+
+        if c < width:
+            for r, (start, length) in enumerate(number_rows):
+                if c >= length:
+                    continue
+                ch = mapped[start + c]
+                if ch == SPACE:
+                    continue
+                blank = False
+                digit = ch - 48
+                # Part 1: extend this row's number horizontally
+                row_values[r] = row_values[r] * 10 + digit
+                row_seen[r] = True
+                # Part 2: extend this column's number vertically (top to bottom)
+                vertical = vertical * 10 + digit
+                has_digit = True
+
+            if c < op_len and mapped[op_start + c] != SPACE:
+                blank = False
+                op = chr(mapped[op_start + c])
+
+        if not blank:
+            in_problem = True
+            if has_digit:
+                col_sum += vertical
+                col_prod *= vertical
+            continue
+
+        # An all-space column: the current problem is over
+        if in_problem:
+            nums = [v for v, seen in zip(row_values, row_seen) if seen]
+            if op == "*":
+                p1 += prod(nums)
+                p2 += col_prod
+            else:
+                p1 += sum(nums)
+                p2 += col_sum
+
+            row_values = [0] * len(number_rows)
+            row_seen = [False] * len(number_rows)
+            col_sum, col_prod, op = 0, 1, None
+            in_problem = False
+
+    return p1, p2
+
+
 if __name__ == "__main__":
     # Standard boilerplate to run from terminal: python script.py < input.txt
-    raw_data = sys.stdin.read()
-    if raw_data:
-        res1, res2 = solver(raw_data)
+    if STREAM_MODE:
+        # Map the redirected input file instead of reading it (pipes can't be mapped)
+        with mmap.mmap(sys.stdin.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            res1, res2 = solver_stream(mapped)
         print(f"Part 1: {res1}")
         print(f"Part 2: {res2}")
+    else:
+        raw_data = sys.stdin.read()
+        if raw_data:
+            res1, res2 = solver_numpy(raw_data) if NUMPY_MODE else solver(raw_data)
+            print(f"Part 1: {res1}")
+            print(f"Part 2: {res2}")
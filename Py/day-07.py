@@ -1,3 +1,17 @@
+import sys
+
+
+# Default puzzle input. Pass a different path as the first argument to override it.
+INPUT_PATH = "inputs/input-07-2025.txt"
+
+# Set to True to propagate whole rows at once with solve_beams_numpy().
+NUMPY_MODE = False
+
+# Set to True to stream the file row by row with solve_beams_stream(), tracking only the
+# columns that actually carry light (takes precedence over NUMPY_MODE).
+STREAM_MODE = False
+
+
 def solve_beams(lines):
     # 'current_row_light' tracks if light is present in each column.
     # We initialize it based on where the light starts (the 'S' or '^' in row 0).
@@ -41,10 +55,113 @@ def solve_beams(lines):
     return total_splits, sum(light_map)
 
 
+def solve_beams_numpy(lines):
+    """
+    Same answers as solve_beams(), but each row is a handful of whole-row array operations
+    instead of a Python loop over every column.
+    """
+    import numpy as np
+
+    width = len(lines[0])
+
+    # Precompute every row's splitter mask as one boolean matrix (rows x width).
+    # Rows are padded/cut to the first row's width, like solve_beams() only ever uses.
+    chars = np.frombuffer(
+        "".join(row[:width].ljust(width) for row in lines).encode(), dtype=np.uint8
+    ).reshape(len(lines), width)
+    splitters = (chars == ord("S")) | (chars == ord("^"))
+
+    # Initialize the first row's light sources
+    light_map = splitters[0].astype(np.int64)
+
+    # Each cell can at most triple per row (its own light plus both neighbors' spill),
+    # so switch to exact Python ints (object dtype) before that could overflow int64.
+    int64_limit = np.iinfo(np.int64).max // 3
+
+    total_splits = 0
+
+    # Process the grid from the second row downwards
+    for mask in splitters[1:]:
+        if light_map.dtype != object and light_map.max() > int64_limit:
+            light_map = light_map.astype(object)
+
+        # If this splitter received any light, count it for Part 1
+        total_splits += int(np.count_nonzero(mask & (light_map != 0)))
+
+        # Light on a splitter spills left and right, everything else falls straight down
+        split = np.where(mask, light_map, 0)
+        next_light_map = np.where(mask, 0, light_map)
+
+        # Spill to the left: column i - 1 receives split[i]
+        next_light_map[:-1] += split[1:]
+        # Spill to the right: column i + 1 receives split[i], except onto another splitter.
+        # solve_beams() walks left to right and resets a splitter column after its left
+        # neighbor has already spilled into it, so that light is lost; we do the same.
+        next_light_map[1:] += np.where(mask[1:], 0, split[:-1])
+
+        light_map = next_light_map
+
+    # Part 1: How many splitters were activated?
+    # Part 2: Total intensity of light reaching the bottom (summed as exact Python ints).
+    return total_splits, sum(int(v) for v in light_map)
+
+
+def solve_beams_stream(rows):
+    """
+    Same answers as solve_beams(), reading 'rows' (any iterable of lines, e.g. an open
+    file) one at a time. Only the active columns are stored, in a {column: beams} dict,
+    and only the characters under them (and their neighbors) are ever looked at.
+    """
+    rows = (row.rstrip("\r\n") for row in rows)
+
+    # Skip leading blank lines, like the .strip() of the whole file does
+    first_row = next((row for row in rows if row.strip()), "")
+    width = len(first_row)
+
+    # Initialize the first row's light sources
+    light = {i: 1 for i, char in enumerate(first_row) if char in "S^"}
+
+    total_splits = 0
+
+    for row_text in rows:
+        next_light = {}
+
+        for i, beams in light.items():
+            if i < len(row_text) and row_text[i] in "S^":
+                # This splitter received light, count it for Part 1
+                total_splits += 1
+
+                # Light from this column "splits" left and right
+                if i > 0:
+                    next_light[i - 1] = next_light.get(i - 1, 0) + beams
+                # solve_beams() resets a splitter column AFTER its left neighbor spilled
+                # into it, so light spilling right onto another splitter is lost.
+                if i < width - 1 and not (
+                    i + 1 < len(row_text) and row_text[i + 1] in "S^"
+                ):
+                    next_light[i + 1] = next_light.get(i + 1, 0) + beams
+            else:
+                # No splitter: the light falls straight down
+                next_light[i] = next_light.get(i, 0) + beams
+
+        light = next_light
+
+    # Part 1: How many splitters were activated?
+    # Part 2: Total intensity of light reaching the bottom.
+    return total_splits, sum(light.values())
+
+
 if __name__ == "__main__":
-    with open("inputs/input-07-2025.txt", "r") as file:
-        input_data = file.read().strip().split("\n")
+    input_path = sys.argv[1] if len(sys.argv) > 1 else INPUT_PATH
+
+    if STREAM_MODE:
+        with open(input_path, "r") as file:
+            p1, p2 = solve_beams_stream(file)
+    else:
+        with open(input_path, "r") as file:
+            input_data = file.read().strip().split("\n")
+
+        p1, p2 = solve_beams_numpy(input_data) if NUMPY_MODE else solve_beams(input_data)
 
-    p1, p2 = solve_beams(input_data)
     print(f"Part 1 (Activated Splitters): {p1}")
     print(f"Part 2 (Total Beams at Bottom): {p2}")
@@ -1,59 +1,427 @@
+import heapq
+import os
 import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from math import isqrt
+from multiprocessing import shared_memory
 
 
-def solve():
-    lines = sys.stdin.read().strip().splitlines()
-    coords = [list(map(int, line.split(","))) for line in lines]
+# Number of worker processes for the Boruvka engine. 0 finishes Part 2 with Kruskal.
+BORUVKA_WORKERS = 0
+
+# Edge counts after which Part 1 (product of the three largest circuits) is reported.
+# All of them are answered by the same Kruskal sweep, e.g. [10, 1000, 50_000].
+PART1_THRESHOLDS = [1000]
+
+
+# SPATIAL INDEX
+# Instead of building all n(n-1)/2 pairs, each point lazily lists its neighbors in
+# increasing distance order, found by searching a uniform grid of cubic cells in growing
+# radii. A heap holds the next candidate edge of every point, so edges come out in the
+# same (d2, i, j) order as sorting every pair, but only as many as Kruskal asks for.
+class SpatialGrid:
+    def __init__(self, coords):
+        self.coords = coords
+        n = len(coords)
+
+        # Pick a cell size that puts roughly one point in each cell
+        lo = [min(c[k] for c in coords) for k in range(3)]
+        hi = [max(c[k] for c in coords) for k in range(3)]
+        volume = 1
+        for k in range(3):
+            volume *= max(hi[k] - lo[k], 1)
+        self.cell = max(1, round((volume / n) ** (1 / 3)))
+        # Squared diagonal of the bounding box: no pair can be further apart
+        self.max_d2 = sum((hi[k] - lo[k]) ** 2 for k in range(3))
+
+        self.cells = {}
+        for i, c in enumerate(coords):
+            self.cells.setdefault(self.key(c), []).append(i)
+
+    def key(self, c):
+        return (c[0] // self.cell, c[1] // self.cell, c[2] // self.cell)
+
+    def within(self, i, min_d2, max_d2):
+        """Returns sorted (d2, j) for all j > i with min_d2 < d2 <= max_d2."""
+        ci = self.coords[i]
+        cx, cy, cz = self.key(ci)
+        reach = isqrt(max_d2) // self.cell + 1
+
+        # Walk the cube of cells around the point, or just the occupied cells when that
+        # is cheaper (far-away outliers need a huge cube that is mostly empty)
+        if (2 * reach + 1) ** 3 <= len(self.cells):
+            keys = (
+                (x, y, z)
+                for x in range(cx - reach, cx + reach + 1)
+                for y in range(cy - reach, cy + reach + 1)
+                for z in range(cz - reach, cz + reach + 1)
+            )
+        else:
+            keys = (
+                k
+                for k in self.cells
+                if abs(k[0] - cx) <= reach
+                and abs(k[1] - cy) <= reach
+                and abs(k[2] - cz) <= reach
+            )
+
+        found = []
+        for k in keys:
+            for j in self.cells.get(k, ()):
+                if j > i:
+                    cj = self.coords[j]
+                    d2 = (ci[0] - cj[0]) ** 2 + (ci[1] - cj[1]) ** 2 + (ci[2] - cj[2]) ** 2
+                    if min_d2 < d2 <= max_d2:
+                        found.append((d2, j))
+        found.sort()
+        return found
+
+    def shell(self, c, reach):
+        """Yields the keys of the cells exactly 'reach' cells away from c's cell."""
+        cx, cy, cz = self.key(c)
+        for x in range(cx - reach, cx + reach + 1):
+            for y in range(cy - reach, cy + reach + 1):
+                if abs(x - cx) == reach or abs(y - cy) == reach:
+                    for z in range(cz - reach, cz + reach + 1):
+                        yield x, y, z
+                elif reach:
+                    yield x, y, cz - reach
+                    yield x, y, cz + reach
+                else:
+                    yield x, y, cz
+
+    def closest_outside(self, i, labels, max_d2):
+        """
+        Returns (d2, j) for the closest point j with labels[j] != labels[i] and
+        d2 <= max_d2 (lowest j on ties), or None. Cells are visited in growing shells
+        around i, so usually only the 27 nearest cells are read.
+        """
+        ci = self.coords[i]
+        own = labels[i]
+        cx, cy, cz = self.key(ci)
+        best = None
+        reach = 0
+        while True:
+            # Once the shell is bigger than the grid, check every cell left in one go
+            last = (2 * reach + 1) ** 3 > len(self.cells)
+            if last:
+                keys = (
+                    k
+                    for k in self.cells
+                    if max(abs(k[0] - cx), abs(k[1] - cy), abs(k[2] - cz)) >= reach
+                )
+            else:
+                keys = self.shell(ci, reach)
+
+            for k in keys:
+                for j in self.cells.get(k, ()):
+                    if labels[j] != own:
+                        cj = self.coords[j]
+                        d2 = (ci[0] - cj[0]) ** 2 + (ci[1] - cj[1]) ** 2 + (ci[2] - cj[2]) ** 2
+                        if d2 <= max_d2 and (best is None or (d2, j) < best):
+                            best = (d2, j)
+
+            # Every point in a further shell is at least reach * cell away
+            beyond = (reach * self.cell) ** 2
+            if last or max_d2 < beyond or (best and best[0] < beyond):
+                return best
+            reach += 1
+
+
+def edges_in_order(coords):
+    """
+    Yields (d2, i, j) with i < j for every pair of points, in increasing (d2, i, j) order,
+    computing neighbors only as they are needed. Memory stays O(n) for typical clouds.
+    """
     n = len(coords)
+    if n < 2:
+        return
 
-    # We use distance squared to avoid the slow square root (math.sqrt)
-    edges = []
-    for i in range(n):
-        for j in range(i + 1, n):
-            d2 = sum((coords[i][k] - coords[j][k]) ** 2 for k in range(3))
-            edges.append((d2, i, j))
-
-    # Sort edges by distance (Kruskal's Algorithm)
-    edges.sort()
-
-    # UNION-FIND DATA STRUCTURE
-    parent = list(range(n))
-    size = [1] * n
-    num_components = n
-
-    def find(i):
-        # Path Compression: makes the tree flat for near-constant lookup
-        if parent[i] == i:
-            return i
-        parent[i] = find(parent[i])
-        return parent[i]
-
-    def union(i, j):
-        nonlocal num_components
-        root_i, root_j = find(i), find(j)
+    grid = SpatialGrid(coords)
+
+    # Per point: the neighbors found so far (sorted), a read position, and the squared
+    # radius already searched (every neighbor at or inside it has been listed)
+    pending = [[] for _ in range(n)]
+    position = [0] * n
+    searched = [-1] * n
+
+    def next_edge(i):
+        # Search a twice larger radius until something new turns up or nothing is left
+        while position[i] == len(pending[i]):
+            if searched[i] >= grid.max_d2:
+                return None
+            radius = max(grid.cell, 2 * isqrt(max(searched[i], 0)))
+            new_d2 = min(radius * radius, grid.max_d2)
+            pending[i] = grid.within(i, searched[i], new_d2)
+            position[i] = 0
+            searched[i] = new_d2
+
+        d2, j = pending[i][position[i]]
+        position[i] += 1
+        return d2, i, j
+
+    heap = [edge for i in range(n) if (edge := next_edge(i))]
+    heapq.heapify(heap)
+
+    while heap:
+        edge = heapq.heappop(heap)
+        yield edge
+        # Replace the popped edge with the next-closest one from the same point
+        nxt = next_edge(edge[1])
+        if nxt:
+            heapq.heappush(heap, nxt)
+
+
+# UNION-FIND DATA STRUCTURE
+# Array-backed with an iterative find (no recursion limit on long chains). It also keeps a
+# running multiset of component sizes, so the k largest components can be read after any
+# union without scanning every node.
+class UnionFind:
+    def __init__(self, n):
+        self.parent = array("q", range(n))
+        self.size = array("q", [1]) * n
+        self.num_components = n
+
+        # Multiset of component sizes: how many components have each size, plus a
+        # max-heap of sizes (negated). Sizes whose count dropped to 0 are skipped lazily.
+        self.size_counts = {1: n} if n else {}
+        self.size_heap = [-1] if n else []
+
+    def find(self, i):
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        # Path Compression: point everything on the way straight at the root
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, i, j):
+        root_i, root_j = self.find(i), self.find(j)
         if root_i != root_j:
             # Union by Size: attach smaller tree to larger tree
-            if size[root_i] < size[root_j]:
+            if self.size[root_i] < self.size[root_j]:
                 root_i, root_j = root_j, root_i
-            parent[root_j] = root_i
-            size[root_i] += size[root_j]
-            num_components -= 1
+            self._remove_size(self.size[root_i])
+            self._remove_size(self.size[root_j])
+            self.parent[root_j] = root_i
+            self.size[root_i] += self.size[root_j]
+            self._add_size(self.size[root_i])
+            self.num_components -= 1
             return True
         return False
 
-    for idx, (_, i, j) in enumerate(edges):
-        if idx == 1000:
-            all_sizes = sorted(
-                [size[k] for k in range(n) if parent[k] == k], reverse=True
-            )
-            print(f"Part 1: {all_sizes[0] * all_sizes[1] * all_sizes[2]}")
+    def _add_size(self, s):
+        if not self.size_counts.get(s):
+            heapq.heappush(self.size_heap, -s)
+        self.size_counts[s] = self.size_counts.get(s, 0) + 1
+
+    def _remove_size(self, s):
+        self.size_counts[s] -= 1
+
+    def largest(self, k):
+        """Sizes of the k largest components (fewer if there aren't k), largest first."""
+        sizes = []
+        popped = []
+        while len(sizes) < k and self.size_heap:
+            s = -heapq.heappop(self.size_heap)
+            count = self.size_counts.get(s, 0)
+            # Stale entry (no component has this size anymore) or a duplicate pushed
+            # after the size came back: drop it
+            if not count or (popped and popped[-1] == -s):
+                continue
+            popped.append(-s)
+            sizes.extend([s] * min(count, k - len(sizes)))
+        for entry in popped:
+            heapq.heappush(self.size_heap, entry)
+        return sizes
+
+    def top_product(self, k=3):
+        """Product of the k largest component sizes."""
+        result = 1
+        for s in self.largest(k):
+            result *= s
+        return result
+
+
+def kruskal_snapshots(coords, thresholds, k=3, connect=True):
+    """
+    One Kruskal sweep that answers Part 1 for every edge count in 'thresholds': the product
+    of the k largest circuits after that many edges were processed. With connect=True it
+    keeps going until everything is one circuit (Part 2).
+    Returns (snapshots {threshold: product}, last edge (i, j) or None, union-find).
+    """
+    n = len(coords)
+    uf = UnionFind(n)
+    # A snapshot only exists if the edge stream is long enough to reach it
+    pending = sorted(t for t in set(thresholds) if t < n * (n - 1) // 2)
+    snapshots = {}
+    last_edge = None
+
+    for idx, (_, i, j) in enumerate(edges_in_order(coords)):
+        while pending and pending[0] == idx:
+            snapshots[pending.pop(0)] = uf.top_product(k)
+        if not pending and (not connect or last_edge):
+            break
 
         # Perform the union
-        if union(i, j):
+        if uf.union(i, j) and uf.num_components == 1:
             # Part 2: Last connection to make one single circuit
-            if num_components == 1:
-                print(f"Part 2: {coords[i][0] * coords[j][0]}")
-                break
+            last_edge = (i, j)
+            # Nothing can merge anymore, so every later snapshot is the same
+            for t in pending:
+                snapshots[t] = uf.top_product(k)
+            break
+
+    return snapshots, last_edge, uf
+
+
+# MULTI-CORE BORUVKA
+# Kruskal needs one globally sorted edge stream, which is inherently serial. Boruvka
+# instead works in rounds: every component picks its cheapest edge to ANY other component,
+# and all those edges are merged at once. Each round at least halves the number of
+# components, and the per-point "closest point in another component" searches are
+# independent, so they are split into point blocks across a process pool. Every worker
+# builds its own SpatialGrid once; only the component labels change between rounds, and
+# they live in shared memory, so workers never copy them.
+#
+# Ties are broken by the full (d2, i, j) key, exactly like the sorted Kruskal stream, so
+# both build the same tree. Kruskal's LAST useful edge is the largest edge of that tree,
+# which is what Part 2 needs.
+_worker_grid = None
+INT64_MAX = (1 << 63) - 1
+
+
+def init_worker(coords):
+    """Worker initializer: indexes the points once for every Boruvka round."""
+    global _worker_grid
+    _worker_grid = SpatialGrid(coords)
+
+
+def cheapest_edges(labels_name, nearest_name, lower_name, start, stop):
+    """Worker: the cheapest outgoing (d2, i, j) edge of each component seen in [start, stop)."""
+    grid = _worker_grid
+    coords = grid.coords
+    shms = [
+        shared_memory.SharedMemory(name=name)
+        for name in (labels_name, nearest_name, lower_name)
+    ]
+    labels, nearest, lower = (shm.buf.cast("q") for shm in shms)
+    try:
+        best = {}
+        for i in range(start, stop):
+            comp = labels[i]
+            j = nearest[i]
+            if j >= 0 and labels[j] != comp:
+                # Components only grow, so a closest point that is still outside stays
+                # the closest one: reuse it from an earlier round
+                ci, cj = coords[i], coords[j]
+                d2 = (ci[0] - cj[0]) ** 2 + (ci[1] - cj[1]) ** 2 + (ci[2] - cj[2]) ** 2
+            else:
+                # Only an edge at most as long as the component's best so far can win.
+                # For the same reason, the closest outside point is never nearer than in
+                # earlier rounds, so points whose old distance already loses are skipped.
+                bound = best[comp][0] if comp in best else grid.max_d2
+                if lower[i] > bound:
+                    continue
+                found = grid.closest_outside(i, labels, bound)
+                if found is None:
+                    nearest[i] = -1
+                    lower[i] = min(bound + 1, INT64_MAX)
+                    continue
+                d2, j = found
+                nearest[i] = j
+                lower[i] = min(d2, INT64_MAX)
+            edge = (d2, min(i, j), max(i, j))
+            if comp not in best or edge < best[comp]:
+                best[comp] = edge
+        return best
+    finally:
+        for view in (labels, nearest, lower):
+            view.release()
+        for shm in shms:
+            shm.close()
+
+
+def boruvka_last_edge(coords, workers=None, uf=None):
+    """
+    Connects everything with parallel Boruvka rounds, starting from the components in
+    'uf' if given. Returns the (i, j) of the edge that Kruskal would add last.
+    """
+    n = len(coords)
+    uf = uf or UnionFind(n)
+    workers = workers or os.cpu_count()
+    block = max(1, -(-n // (4 * workers)))
+
+    # Per point: its component, its closest point in another component (-1: unknown) and
+    # a lower bound on that squared distance (capped to fit in 64 bits)
+    shms = [shared_memory.SharedMemory(create=True, size=n * 8) for _ in range(3)]
+    labels, nearest, lower = (shm.buf.cast("q") for shm in shms)
+    nearest[:] = array("q", [-1]) * n
+    lower[:] = array("q", [0]) * n
+    try:
+        # The largest tree edge so far. Any edges merged before this call are smaller
+        # than every edge still missing, so only edges added here can be the answer.
+        last = None
+        with ProcessPoolExecutor(
+            workers, initializer=init_worker, initargs=(coords,)
+        ) as pool:
+            while uf.num_components > 1:
+                labels[:] = array("q", [uf.find(k) for k in range(n)])
+
+                futures = [
+                    pool.submit(
+                        cheapest_edges,
+                        *(shm.name for shm in shms),
+                        start,
+                        min(start + block, n),
+                    )
+                    for start in range(0, n, block)
+                ]
+
+                # Combine the per-block winners into one cheapest edge per component
+                best = {}
+                for future in futures:
+                    for comp, edge in future.result().items():
+                        if comp not in best or edge < best[comp]:
+                            best[comp] = edge
+
+                # Perform the unions (two components may pick the same edge)
+                for edge in best.values():
+                    if uf.union(edge[1], edge[2]) and (last is None or edge > last):
+                        last = edge
+    finally:
+        for view in (labels, nearest, lower):
+            view.release()
+        for shm in shms:
+            shm.close()
+            shm.unlink()
+
+    return last[1], last[2]
+
+
+def solve():
+    lines = sys.stdin.read().strip().splitlines()
+    coords = [list(map(int, line.split(","))) for line in lines]
+
+    # We use distance squared to avoid the slow square root (math.sqrt)
+    # Edges arrive lazily in increasing distance order (Kruskal's Algorithm)
+    # In Boruvka mode Kruskal only runs far enough for Part 1
+    snapshots, last_edge, uf = kruskal_snapshots(
+        coords, PART1_THRESHOLDS, connect=not BORUVKA_WORKERS
+    )
+
+    for t in sorted(snapshots):
+        label = "" if len(PART1_THRESHOLDS) == 1 else f" ({t} edges)"
+        print(f"Part 1{label}: {snapshots[t]}")
+
+    if BORUVKA_WORKERS and uf.num_components > 1:
+        last_edge = boruvka_last_edge(coords, BORUVKA_WORKERS, uf)
+
+    if last_edge:
+        i, j = last_edge
+        print(f"Part 2: {coords[i][0] * coords[j][0]}")
 
 
 if __name__ == "__main__":
@@ -1,5 +1,126 @@
 import sys
-from itertools import combinations, pairwise
+from bisect import bisect_left
+from itertools import chain, pairwise
+
+import numpy as np
+
+
+class PolygonGrid:
+    """
+    Inside/outside map of a polygon whose corners are the red tiles, built on a
+    coordinate-compressed grid with a 2-D prefix sum of the "outside" cells, so
+    "is this rectangle fully inside the shape (or on its border)" is an O(1) lookup.
+
+    Every distinct vertex coordinate gets its own 1-wide cell, and every gap between two
+    consecutive coordinates becomes a single cell. No edge starts or ends inside a gap,
+    so each compressed cell is either entirely inside the shape or entirely outside.
+    """
+
+    def __init__(self, points):
+        self.xs = sorted({x for x, _ in points})
+        self.ys = sorted({y for _, y in points})
+        cols = 2 * len(self.xs) - 1
+        rows = 2 * len(self.ys) - 1
+
+        # Coordinate of vertex i lives in cell 2*i, the gap after it in cell 2*i + 1
+        col_of = {x: 2 * i for i, x in enumerate(self.xs)}
+        row_of = {y: 2 * i for i, y in enumerate(self.ys)}
+
+        # Difference arrays: vertical edges counted per (row, col), border cells marked
+        crossings = np.zeros((rows + 1, cols), dtype=np.int32)
+        border_v = np.zeros((rows + 1, cols), dtype=np.int32)
+        border_h = np.zeros((rows, cols + 1), dtype=np.int32)
+
+        for (ax, ay), (bx, by) in pairwise(points + [points[0]]):
+            if ax == bx:
+                c = col_of[ax]
+                r1, r2 = sorted((row_of[ay], row_of[by]))
+                # Ray casting to the right: the edge flips "inside" for rows [r1, r2)
+                crossings[r1, c] += 1
+                crossings[r2, c] -= 1
+                border_v[r1, c] += 1
+                border_v[r2 + 1, c] -= 1
+            else:
+                r = row_of[ay]
+                c1, c2 = sorted((col_of[ax], col_of[bx]))
+                border_h[r, c1] += 1
+                border_h[r, c2 + 1] -= 1
+
+        crossings = np.cumsum(crossings, axis=0)[:rows]
+        border = (np.cumsum(border_v, axis=0)[:rows] > 0) | (
+            np.cumsum(border_h, axis=1)[:, :cols] > 0
+        )
+
+        # A cell is inside if an odd number of vertical edges lie strictly to its right
+        to_the_right = np.cumsum(crossings[:, ::-1], axis=1)[:, ::-1] - crossings
+        outside = ~((to_the_right % 2 == 1) | border)
+
+        # Gaps between neighboring coordinates (like 3 and 4) hold no tiles at all
+        empty_cols = np.flatnonzero(np.diff(self.xs) == 1) * 2 + 1
+        empty_rows = np.flatnonzero(np.diff(self.ys) == 1) * 2 + 1
+        outside[:, empty_cols] = False
+        outside[empty_rows, :] = False
+
+        # prefix[r, c] = number of outside cells in rows < r and cols < c
+        self.prefix = np.zeros((rows + 1, cols + 1), dtype=np.int64)
+        self.prefix[1:, 1:] = outside.cumsum(axis=0).cumsum(axis=1)
+
+    def contains_rect(self, x1, y1, x2, y2):
+        """True if every tile of the rectangle (corners on vertex coordinates) is inside."""
+        c1 = 2 * bisect_left(self.xs, x1)
+        c2 = 2 * bisect_left(self.xs, x2) + 1
+        r1 = 2 * bisect_left(self.ys, y1)
+        r2 = 2 * bisect_left(self.ys, y2) + 1
+        p = self.prefix
+        return p[r2, c2] - p[r1, c2] - p[r2, c1] + p[r1, c1] == 0
+
+
+# Each band of candidates_by_area() covers areas down to this fraction of the band above
+BAND_RATIO = 3 / 4
+
+
+def candidates_by_area(points):
+    """
+    Lazily yields every rectangle (min_x, min_y, max_x, max_y) spanned by two points,
+    largest area first, without building the list of all pairs.
+
+    The areas are cut into bands [limit * BAND_RATIO, limit) from the top down. Each band
+    is collected with one vectorized pass over the points (one row of partners at a
+    time), sorted, and yielded before the next band is even looked at, so a search that
+    stops early only ever holds the pairs of its last band.
+    """
+    n = len(points)
+    # Areas of huge coordinates would overflow int64, so fall back to Python ints
+    span = max(max(abs(x), abs(y)) for x, y in points)
+    dtype = np.int64 if span < 1 << 30 else object
+    xs = np.array([x for x, _ in points], dtype=dtype)
+    ys = np.array([y for _, y in points], dtype=dtype)
+
+    def row_areas(i):
+        """Areas of the rectangles of point i with every point j > i."""
+        return (abs(xs[i + 1 :] - xs[i]) + 1) * (abs(ys[i + 1 :] - ys[i]) + 1)
+
+    largest = max((int(row_areas(i).max()) for i in range(n - 1)), default=0)
+
+    # Each band holds the areas in [floor, limit]; 'limit' only includes on the first band
+    limit = largest
+    floor = int(largest * BAND_RATIO)
+    first = True
+    while limit > 0:
+        band = []
+        for i in range(n - 1):
+            areas = row_areas(i)
+            keep = (areas >= floor) & ((areas <= limit) if first else (areas < limit))
+            for j in np.flatnonzero(keep):
+                band.append((-int(areas[j]), i, i + 1 + int(j)))
+        band.sort()
+
+        for _, i, j in band:
+            (x1, y1), (x2, y2) = points[i], points[j]
+            yield min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
+
+        limit, first = floor, False
+        floor = int(floor * BAND_RATIO) if floor > 1 else 0
 
 
 def solve():
@@ -19,39 +140,26 @@ def solve():
     def get_area(x1, y1, x2, y2):
         return (abs(x2 - x1) + 1) * (abs(y2 - y1) + 1)
 
-    # We create a list of all perimeter lines of the shape
-    # pairwise([A, B, C]) -> (A, B), (B, C)
-    edges = []
-    for (a, b), (c, d) in pairwise(points + [points[0]]):
-        # We store edges as (min_x, min_y, max_x, max_y) for easy comparison
-        edges.append((min(a, c), min(b, d), max(a, c), max(b, d)))
-
-    # Every pair of points in the input defines a candidate rectangle
-    candidates = []
-    for p1, p2 in combinations(points, 2):
-        x1, y1 = p1
-        x2, y2 = p2
-        candidates.append((min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)))
+    # We compress the shape into an inside/outside grid once, then every candidate
+    # rectangle is checked with a constant-time prefix-sum lookup
+    shape = PolygonGrid(points)
 
-    # Sort candidates by area, largest first
-    candidates.sort(key=lambda p: get_area(*p), reverse=True)
+    # Every pair of points in the input defines a candidate rectangle.
+    # They come out lazily, largest area first
+    candidates = candidates_by_area(points)
+    first = next(candidates, None)
+    if first is None:
+        return
 
     # Part 1: The largest possible area between any two points
-    # (The first item in our sorted list)
-    print(f"Part 1: {get_area(*candidates[0])}")
+    # (The first rectangle out of the generator)
+    print(f"Part 1: {get_area(*first)}")
 
     # Part 2: The largest "Solid" area
-    for cx1, cy1, cx2, cy2 in candidates:
-        # Check if any edge of the shape passes THROUGH this rectangle
-        is_invalid = False
-        for ex1, ey1, ex2, ey2 in edges:
-            # Intersection logic: if the edge is inside the rectangle bounds
-            if ex1 < cx2 and ey1 < cy2 and ex2 > cx1 and ey2 > cy1:
-                is_invalid = True
-                break
-
-        # If no edges intersected, this is our winner!
-        if not is_invalid:
+    # We stop pulling candidates as soon as one fits inside the shape
+    for cx1, cy1, cx2, cy2 in chain([first], candidates):
+        # The whole rectangle must lie inside the shape (or on its border)
+        if shape.contains_rect(cx1, cy1, cx2, cy2):
             print(f"Part 2: {get_area(cx1, cy1, cx2, cy2)}")
             break
 
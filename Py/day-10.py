@@ -1,5 +1,378 @@
 import sys
-from functools import cache
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from math import lcm
+
+# Number of worker processes for solve_parallel(). 0 solves the machines one by one.
+PARALLEL_WORKERS = 0
+# Machines sent to a worker at a time, and how many of the slowest to list at the end.
+PARALLEL_CHUNK_SIZE = 64
+SLOWEST_SHOWN = 5
+
+# Largest number of halved joltage goals remembered per machine (least recently used go).
+JOLTAGE_MEMO_SIZE = 1 << 16
+
+# Parity classes hold 2^(null space dimension) button sets. Above this dimension we first
+# try a branch-and-bound search over press counts instead of listing them.
+MAX_CLASS_DIMENSION = 16
+# Most search nodes branch_and_bound() may visit. If it runs out, the machine goes back to
+# the (always exact) parity classes.
+BRANCH_AND_BOUND_NODES = 1 << 18
+
+
+class GF2System:
+    """
+    The buttons as a linear system over GF(2): pressing a button twice cancels out, so
+    we only ask which SET of buttons XORs to a given light mask.
+
+    Gaussian elimination splits the buttons into a basis (one pivot bit each) and a
+    null space: button sets that toggle nothing. Any solution is one particular solution
+    XOR some combination of the null space, so the cheapest one only needs 2^(null space
+    dimension) tries instead of 2^(buttons).
+    """
+
+    def __init__(self, buttons):
+        self.buttons = buttons
+        # Reduced basis: (pivot bit, light mask, set of buttons that produces it)
+        self.basis = []
+        # Button sets (as bitmasks over buttons) that toggle no light at all
+        self.null_space = []
+        self.memo = {}
+
+        for b, mask in enumerate(buttons):
+            used = 1 << b
+            for pivot, vec, combo in self.basis:
+                if mask & pivot:
+                    mask ^= vec
+                    used ^= combo
+            if mask:
+                # A new pivot: its lowest set bit
+                self.basis.append((mask & -mask, mask, used))
+            else:
+                self.null_space.append(used)
+
+    def particular(self, target):
+        """Some button set that produces 'target', or None if it can't be reached."""
+        used = 0
+        for pivot, vec, combo in self.basis:
+            if target & pivot:
+                target ^= vec
+                used ^= combo
+        return None if target else used
+
+    def min_presses(self, target):
+        """The fewest button presses that produce 'target' (None if unreachable)."""
+        if target in self.memo:
+            return self.memo[target]
+
+        start = self.particular(target)
+        if start is None:
+            best = None
+        elif len(self.null_space) <= len(self.buttons) // 2:
+            best = self._search_null_space(start)
+        else:
+            best = self._meet_in_the_middle(target)
+
+        self.memo[target] = best
+        return best
+
+    def _search_null_space(self, start):
+        # Walk every combination of the null space in Gray-code order: each step flips
+        # exactly one basis vector, so each try is a single XOR
+        current = start
+        best = current.bit_count()
+        for step in range(1, 1 << len(self.null_space)):
+            flip = (step & -step).bit_length() - 1
+            current ^= self.null_space[flip]
+            best = min(best, current.bit_count())
+        return best
+
+    def _meet_in_the_middle(self, target):
+        # Big null space: split the buttons in two halves and match their XOR masks
+        half = len(self.buttons) // 2
+
+        def subset_masks(buttons):
+            # {light mask: fewest presses} over every subset of 'buttons'
+            found = {0: 0}
+            for b_mask in buttons:
+                for mask, count in list(found.items()):
+                    new_mask = mask ^ b_mask
+                    if new_mask not in found or count + 1 < found[new_mask]:
+                        found[new_mask] = count + 1
+            return found
+
+        left = subset_masks(self.buttons[:half])
+        right = subset_masks(self.buttons[half:])
+        return min(
+            count + left[target ^ mask]
+            for mask, count in right.items()
+            if target ^ mask in left
+        )
+
+
+class JoltageSolver:
+    """
+    Exact fewest presses for a joltage goal, using the "binary lifting" idea:
+    every press count is 2*y + r with r in {0, 1}, so the buttons pressed an odd number of
+    times (the set r) must match the goal's parity, and what is left is exactly twice a
+    smaller goal: f(goal) = min over matching r of |r| + 2 * f((goal - effect(r)) / 2).
+
+    Different button sets with the same parity can hit the counters very differently, so
+    we keep ALL of them: each parity class lists (press count, per-counter effect). A class
+    is exactly "one particular solution XOR the null space", read off the GF(2) system.
+    """
+
+    def __init__(self, system, counters):
+        self.system = system
+        self.counters = counters
+        # For every button: which counters it adds 1 to
+        self.hits = [
+            [c for c in range(counters) if mask >> c & 1] for mask in system.buttons
+        ]
+        self.classes = {}
+        self.min_presses = lru_cache(maxsize=JOLTAGE_MEMO_SIZE)(self._min_presses)
+
+    def parity_class(self, parity):
+        """[(press count, effect vector)] of every button set with this parity."""
+        if parity in self.classes:
+            return self.classes[parity]
+
+        start = self.system.particular(parity)
+        entries = {}
+        if start is not None:
+            null_space = self.system.null_space
+            current = start
+            for step in range(1 << len(null_space)):
+                if step:
+                    # Gray-code walk over the null space, as in GF2System
+                    current ^= null_space[(step & -step).bit_length() - 1]
+
+                effect = [0] * self.counters
+                b, rest = 0, current
+                while rest:
+                    if rest & 1:
+                        for c in self.hits[b]:
+                            effect[c] += 1
+                    rest >>= 1
+                    b += 1
+
+                # Same effect from two sets: only the cheaper one matters
+                effect = tuple(effect)
+                count = current.bit_count()
+                if effect not in entries or count < entries[effect]:
+                    entries[effect] = count
+
+        self.classes[parity] = sorted((count, effect) for effect, count in entries.items())
+        return self.classes[parity]
+
+    def solve(self, goal):
+        """Fewest presses to reach 'goal' exactly, or None if it can't be done."""
+        if len(self.system.null_space) > MAX_CLASS_DIMENSION:
+            best, complete = self.branch_and_bound(goal)
+            if complete:
+                return best
+            # Out of budget: list the parity classes after all
+        best = self.min_presses(tuple(goal))
+        return None if best == float("inf") else best
+
+    def _min_presses(self, goal):
+        # Base Case: All joltages are zero
+        if not any(goal):
+            return 0
+
+        # Determine the parity bitmask of the current goal
+        parity = 0
+        for i, v in enumerate(goal):
+            if v & 1:
+                parity |= 1 << i
+
+        best = float("inf")
+        for count, effect in self.parity_class(parity):
+            # Cheapest sets come first: once |r| alone can't win, nothing later can
+            if count >= best:
+                break
+            if any(e > v for e, v in zip(effect, goal)):
+                continue
+            rest = self.min_presses(tuple((v - e) // 2 for v, e in zip(goal, effect)))
+            best = min(best, count + 2 * rest)
+
+        return best
+
+    def branch_and_bound(self, goal, budget=BRANCH_AND_BOUND_NODES):
+        """
+        Fallback for huge null spaces: choose a press count per button. Returns (fewest
+        presses or None, whether the search finished within 'budget' nodes); an
+        unfinished search proves nothing.
+
+        Each step picks the counter that the fewest unused buttons can still raise and
+        decides its widest button; a counter with one button left fixes its count.
+        """
+        # Buttons with the same counters are interchangeable, so each mask is one choice
+        masks = sorted(set(self.system.buttons) - {0}, key=lambda m: -m.bit_count())
+        hits = [[c for c in range(self.counters) if m >> c & 1] for m in masks]
+        # by_counter[c]: indices of the masks that raise counter c, widest first
+        by_counter = [
+            [b for b, m in enumerate(masks) if m >> c & 1] for c in range(self.counters)
+        ]
+
+        # Common denominator for the 1/width weights below
+        scale = lcm(*range(1, self.counters + 1))
+
+        best = [float("inf")]
+        nodes = [0]
+        remaining = list(goal)
+        used = [False] * len(masks)
+
+        def search(cost):
+            nodes[0] += 1
+            if nodes[0] > budget:
+                return
+            need = max(remaining, default=0)
+            if need == 0:
+                best[0] = min(best[0], cost)
+                return
+
+            # The most constrained counter. Along the way, weigh every counter by the
+            # widest unused button that raises it: a press of a button with w counters
+            # adds at most 1/w to the weighted total of each of them, so at most 1 in all
+            counter, options, weighted = None, None, 0
+            for c, v in enumerate(remaining):
+                if not v:
+                    continue
+                free = [b for b in by_counter[c] if not used[b]]
+                if not free:
+                    return
+                if options is None or len(free) < len(options):
+                    counter, options = c, free
+                weighted += v * (scale // len(hits[free[0]]))
+
+            # Each press lowers one counter by at most 1, and the weighted total by at most 1
+            if cost + max(need, -(-weighted // scale)) >= best[0]:
+                return
+
+            b = options[0]
+            most = min(remaining[c] for c in hits[b])
+            # The last button for this counter has to cover all of it
+            least = remaining[counter] if len(options) == 1 else 0
+            used[b] = True
+            # Try pressing this button as often as possible first
+            for presses in range(most, least - 1, -1):
+                for c in hits[b]:
+                    remaining[c] -= presses
+                search(cost + presses)
+                for c in hits[b]:
+                    remaining[c] += presses
+            used[b] = False
+
+        search(0)
+        found = None if best[0] == float("inf") else best[0]
+        return found, nodes[0] <= budget
+
+
+def parse_machine(line):
+    """
+    Turns one input line into a compact record:
+    (indicator bitmask, tuple of button bitmasks, tuple of joltage targets).
+    """
+    # PARSING
+    # Format: [Indicator] [Button1] [Button2] ... [Joltage]
+    parts = line.split()
+
+    # Indicator: [.#..#] -> bitmask
+    indicator_str = parts[0][1:-1]
+    target_indicator_mask = 0
+    for i, char in enumerate(indicator_str):
+        if char == "#":
+            target_indicator_mask |= 1 << i
+
+    # Joltage: (38,27,...) -> tuple of ints
+    target_joltage = tuple(map(int, parts[-1][1:-1].split(",")))
+
+    # Buttons: (0,1,4) -> list of bitmasks
+    buttons = []
+    for b_str in parts[1:-1]:
+        mask = 0
+        for pos in b_str[1:-1].split(","):
+            mask |= 1 << int(pos)
+        buttons.append(mask)
+
+    return target_indicator_mask, tuple(buttons), target_joltage
+
+
+def solve_record(record):
+    """
+    Solves one parsed machine. Returns (indicator presses, joltage presses, stats), where
+    stats is (wall time in seconds, memoised goals, button sets listed in parity classes).
+    Unreachable targets give None.
+    """
+    started = time.perf_counter()
+    target_indicator_mask, buttons, target_joltage = record
+
+    # BUTTONS AS A GF(2) LINEAR SYSTEM
+    # For every parity mask we need the fewest presses that produce it. Instead of
+    # tabulating all 2^B button subsets, we solve for each mask on demand from the
+    # reduced basis (and remember the answers).
+    system = GF2System(list(buttons))
+
+    # --- PART 1: INDICATOR LIGHTS ---
+    # The fewest presses to hit the exact parity mask
+    indicator_presses = system.min_presses(target_indicator_mask)
+
+    # --- PART 2: JOLTAGE LEVELS ---
+    # Halve the goal level by level, trying every button set of the right parity
+    solver = JoltageSolver(system, len(target_joltage))
+    joltage_presses = solver.solve(target_joltage)
+
+    stats = (
+        time.perf_counter() - started,
+        solver.min_presses.cache_info().currsize,
+        sum(len(entries) for entries in solver.classes.values()),
+    )
+    return indicator_presses, joltage_presses, stats
+
+
+def solve_chunk(chunk):
+    """Worker: solves a list of (line number, record) pairs."""
+    return [(line_no, *solve_record(record)) for line_no, record in chunk]
+
+
+def solve_parallel(workers=None, chunk_size=PARALLEL_CHUNK_SIZE):
+    """
+    Same totals as solve_machine(), with the machines spread over a process pool in
+    chunks. Results are added up as chunks finish, and the slowest machines are listed.
+    """
+    total_indicator_presses = 0
+    total_joltage_presses = 0
+    timings = []
+
+    records = [
+        (line_no, parse_machine(line))
+        for line_no, line in enumerate(sys.stdin, 1)
+        if line.strip()
+    ]
+    chunks = [records[i : i + chunk_size] for i in range(0, len(records), chunk_size)]
+
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(solve_chunk, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            for line_no, indicator, joltage, stats in future.result():
+                if indicator is not None:
+                    total_indicator_presses += indicator
+                if joltage is not None:
+                    total_joltage_presses += joltage
+                timings.append((stats, line_no))
+
+    print(f"Fewest Button Presses: {total_indicator_presses}")
+    print(f"Actual Button presses for counters: {total_joltage_presses}")
+
+    print(f"Slowest machines (of {len(timings)}):")
+    slowest = sorted(timings, reverse=True)[:SLOWEST_SHOWN]
+    for (elapsed, memo_size, combos), line_no in slowest:
+        print(
+            f"  line {line_no}: {elapsed * 1000:.1f} ms, "
+            f"{memo_size} memoised goals, {combos} combos"
+        )
 
 
 def solve_machine():
@@ -10,93 +383,11 @@ def solve_machine():
         if not line.strip():
             continue
 
-        # PARSING
-        # Format: [Indicator] [Button1] [Button2] ... [Joltage]
-        parts = line.split()
-        
-        # Indicator: [.#..#] -> bitmask
-        indicator_str = parts[0][1:-1]
-        target_indicator_mask = 0
-        for i, char in enumerate(indicator_str):
-            if char == "#":
-                target_indicator_mask |= 1 << i
-
-        # Joltage: (38,27,...) -> tuple of ints
-        target_joltage = tuple(map(int, parts[-1][1:-1].split(",")))
-
-        # Buttons: (0,1,4) -> list of bitmasks
-        buttons = []
-        for b_str in parts[1:-1]:
-            mask = 0
-            for pos in b_str[1:-1].split(","):
-                mask |= 1 << int(pos)
-            buttons.append(mask)
-
-        # PRE-COMPUTE PARITY COMBINATIONS
-        # We need to know every way to combine buttons to hit a parity mask
-        # Map: bitmask -> list of (press_count, button_usage_mask)
-        # For Part 2, we need to know WHICH buttons were used to subtract them correctly
-        combos = {0: 0}  # {bitmask: num_presses}
-        for b_mask in buttons:
-            new_combos = combos.copy()
-            for mask, count in combos.items():
-                new_mask = mask ^ b_mask
-                if new_mask not in new_combos or count + 1 < new_combos[new_mask]:
-                    new_combos[new_mask] = count + 1
-            combos = new_combos
-
-        # --- PART 1: INDICATOR LIGHTS ---
-        # The fewest presses to hit the exact parity mask
-        if target_indicator_mask in combos:
-            total_indicator_presses += combos[target_indicator_mask]
-
-        # --- PART 2: JOLTAGE LEVELS ---
-        # RECURSIVE SOLVER (The "Binary Lifting" logic)
-        @cache
-        def get_min_joltage_presses(current_goal):
-            # Base Case: All joltages are zero
-            if all(v == 0 for v in current_goal):
-                return 0
-
-            # Determine the parity bitmask of the current goal
-            # current_parity_mask = sum((v % 2) << i for i, v in enumerate(current_goal))
-            current_parity = 0
-            for i, v in enumerate(current_goal):
-                if v % 2 != 0:
-                    current_parity |= 1 << i
-
-            # If the parity mask isn't reachable by any button combo,
-            # this path is impossible
-            if current_parity not in combos:
-                return float("inf")
-
-            best = float("inf")
-
-            # We must press a combination that satisties the current parity
-            # But there might be multiple combinations  that result in the same mask!
-            # However, for this puzzle, the "cheapest" parity match is usually best
-            for mask, presses in combos.items():
-                if mask == current_parity:
-                    # Subtract the effect of these buttons and divide by 2
-                    next_goal = []
-                    possible = True
-                    for i, val in enumerate(current_goal):
-                        # If bit i is set in the mask, it means an odd button combo hit it
-                        effect = (mask >> i) & 1
-                        remaining = val - effect
-                        if remaining < 0:
-                            possible = False
-                            break
-                        next_goal.append(remaining // 2)
-                    if possible:
-                        res = get_min_joltage_presses(tuple(next_goal))
-                        if res != float("inf"):
-                            best = min(best, presses + 2 * res)
-
-            return best
-
-        joltage_res = get_min_joltage_presses(target_joltage)
-        if joltage_res != float("inf"):
+        indicator_presses, joltage_res, _ = solve_record(parse_machine(line))
+
+        if indicator_presses is not None:
+            total_indicator_presses += indicator_presses
+        if joltage_res is not None:
             total_joltage_presses += joltage_res
 
     print(f"Fewest Button Presses: {total_indicator_presses}")
@@ -104,6 +395,7 @@ def solve_machine():
 
 
 if __name__ == "__main__":
-    # Increase recursion depth for deep binary lifting
-    sys.setrecursionlimit(5000)
-    solve_machine()
+    if PARALLEL_WORKERS:
+        solve_parallel(PARALLEL_WORKERS)
+    else:
+        solve_machine()
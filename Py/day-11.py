@@ -1,47 +1,227 @@
+import hashlib
+import os
+import struct
 import sys
-import functools as ft
+from array import array
+from collections import deque
+from itertools import permutations
+
+# Set to a directory to cache compiled graphs there, keyed on the hash of the input.
+CACHE_DIR = None
+
+# Cache file layout: magic, node count, edge count, byte length of the names, then the
+# offsets and targets arrays ('I') and finally the node names joined by newlines.
+CACHE_HEADER = struct.Struct("<8sIII")
+CACHE_MAGIC = b"AOC11CS2"
+
+
+class CSRGraph:
+    """
+    The graph with every node name interned to a dense integer ID, and adjacency stored
+    in compressed sparse row (CSR) form: the neighbors of node i are
+    targets[offsets[i] : offsets[i + 1]]. Two flat arrays instead of a dict of string lists.
+    """
+
+    def __init__(self, names, offsets, targets):
+        self.names = names
+        self.offsets = offsets
+        self.targets = targets
+        self.index = {name: i for i, name in enumerate(names)}
+
+    def neighbors(self, node):
+        return self.targets[self.offsets[node] : self.offsets[node + 1]]
+
+    @classmethod
+    def parse(cls, data):
+        """Builds the graph from the raw bytes of the whole input ("aaa: bbb ccc" lines)."""
+        ids = {}
+        adjacency = {}
+        for line in data.split(b"\n"):
+            if not line.strip():
+                continue
+            src, _, rest = line.partition(b":")
+            # setdefault hands out the next free ID the first time a name shows up
+            src_id = ids.setdefault(src.strip(), len(ids))
+            adjacency[src_id] = [ids.setdefault(n, len(ids)) for n in rest.split()]
+
+        offsets = array("I", [0])
+        targets = array("I")
+        for node in range(len(ids)):
+            targets.extend(adjacency.get(node, ()))
+            offsets.append(len(targets))
+
+        names = [name.decode() for name in ids]
+        return cls(names, offsets, targets)
+
+    def to_bytes(self):
+        names = "\n".join(self.names).encode()
+        return b"".join(
+            (
+                CACHE_HEADER.pack(
+                    CACHE_MAGIC, len(self.names), len(self.targets), len(names)
+                ),
+                self.offsets.tobytes(),
+                self.targets.tobytes(),
+                names,
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, blob):
+        if len(blob) < CACHE_HEADER.size:
+            raise ValueError("Truncated day-11 graph")
+        magic, node_count, edge_count, names_size = CACHE_HEADER.unpack_from(blob)
+        if magic != CACHE_MAGIC:
+            raise ValueError("Not a compiled day-11 graph")
+
+        width = array("I").itemsize
+        pos = CACHE_HEADER.size
+        expected = pos + (node_count + 1 + edge_count) * width + names_size
+        if len(blob) != expected:
+            raise ValueError(f"Truncated day-11 graph ({len(blob)} of {expected} bytes)")
+        offsets = array("I", blob[pos : pos + (node_count + 1) * width])
+        pos += (node_count + 1) * width
+        targets = array("I", blob[pos : pos + edge_count * width])
+        pos += edge_count * width
+        names = blob[pos:].decode().split("\n") if node_count else []
+        if len(names) != node_count or offsets[-1] != edge_count:
+            raise ValueError("Corrupt day-11 graph")
+        return cls(names, offsets, targets)
+
+    @classmethod
+    def load(cls, data, cache_dir=None):
+        """
+        Parses 'data', or with a cache directory, reads the graph compiled from the same
+        input earlier (a single file read) and compiles + saves it otherwise.
+        """
+        if not cache_dir:
+            return cls.parse(data)
+
+        digest = hashlib.sha256(data).hexdigest()[:32]
+        path = os.path.join(cache_dir, f"day-11-{digest}.csr")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                blob = f.read()
+            try:
+                return cls.from_bytes(blob)
+            except ValueError:
+                # A damaged cache file (e.g. from an older format) is rebuilt below
+                pass
+
+        graph = cls.parse(data)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file (one per process, in case two runs race) and swap it
+        # in, so an interrupted run never leaves half a cache file behind
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(graph.to_bytes())
+        os.replace(tmp_path, path)
+        return graph
+
+
+class PathCounter:
+    """
+    Counts paths in a DAG without recursion. The graph is topologically sorted once;
+    the number of paths from EVERY node to a target then comes out of one sweep from
+    the sinks back, and that vector is kept for any later query to the same
+    target (instead of a separate (src, dest) cache per destination).
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.names = graph.names
+        self.index = graph.index
+        offsets, targets = graph.offsets, graph.targets
+
+        # Kahn's algorithm, run backwards from the sinks: repeatedly take a node whose
+        # neighbors have all been taken. That lists every node after its neighbors, and
+        # leaves out exactly the nodes that can run into a cycle, so a cycle only matters
+        # if a query starts in front of it (see counts_to).
+        predecessors = [[] for _ in self.names]
+        for node in range(len(self.names)):
+            for k in range(offsets[node], offsets[node + 1]):
+                predecessors[targets[k]].append(node)
+        outdegree = [offsets[i + 1] - offsets[i] for i in range(len(self.names))]
+        ready = deque(i for i, d in enumerate(outdegree) if d == 0)
+        self.order = []
+        while ready:
+            node = ready.popleft()
+            self.order.append(node)
+            for n in predecessors[node]:
+                outdegree[n] -= 1
+                if outdegree[n] == 0:
+                    ready.append(n)
+
+        self.vectors = {}
+
+    def counts_to(self, dest):
+        """
+        counts[i] = number of paths from node i to 'dest' (computed once per target).
+        Nodes whose paths run into a cycle get None instead of a count.
+        """
+        if dest not in self.vectors:
+            offsets, targets = self.graph.offsets, self.graph.targets
+            if dest in self.index:
+                goal = self.index[dest]
+                # Nodes that can run into a cycle are not in the order and stay None
+                counts = [None] * len(self.names)
+                # A node's neighbors come before it in the order, so they are final
+                for node in self.order:
+                    if node == goal:
+                        # Arriving at 'dest' ends the path, whatever follows it
+                        counts[node] = 1
+                    else:
+                        start, stop = offsets[node], offsets[node + 1]
+                        counts[node] = sum(counts[targets[k]] for k in range(start, stop))
+            else:
+                counts = [0] * len(self.names)
+            self.vectors[dest] = counts
+        return self.vectors[dest]
+
+    def paths(self, src, dest):
+        if src not in self.index:
+            return 1 if src == dest else 0
+        count = self.counts_to(dest)[self.index[src]]
+        if count is None:
+            raise ValueError(f"Paths from {src} run into a cycle, the count is infinite")
+        return count
+
+    def paths_through(self, src, dest, waypoints):
+        """
+        Paths from 'src' to 'dest' that visit every waypoint, in any order.
+        A path in a DAG visits its waypoints in exactly one order, so we add up
+        the chained counts of every ordering (impossible orders contribute 0).
+        """
+        total = 0
+        for order in permutations(waypoints):
+            stops = [src, *order, dest]
+            count = 1
+            for a, b in zip(stops, stops[1:]):
+                count *= self.paths(a, b)
+                if not count:
+                    break
+            total += count
+        return total
 
 
 def solve():
-    # THE INPUT HACK:
-    # This builds the entire graph dictionary in one go.
-    # We split each line by the colon, thenn split the right side by whitespace.
-    # 'iter(sys.stdin.readline, "")' is a fast way to consume the streamm.
-    try:
-        G = {
-            parts[0].strip(): parts[1].split()
-            for line in iter(sys.stdin.readline, "")
-            if (parts := line.split(":", 1))
-        }
-    except EOFError:
+    # Read the whole input as one bytes buffer and compile it into a CSR graph
+    # (or load the compiled graph from the cache)
+    data = sys.stdin.buffer.read()
+    if not data.strip():
         return
 
-    @ft.cache
-    def paths(src, dest):
-        # BASE CASE: We've arrived
-        if src == dest:
-            return 1
-
-        # RECURSIVE STEP:
-        # Sum up paths from all neighbors.
-        # G.get(src, []) handles 'sink' nodes like "out" that have no neighbors.
-        return sum(paths(neighbor, dest) for neighbor in G.get(src, []))
+    counter = PathCounter(CSRGraph.load(data, CACHE_DIR))
 
     # PART 1: Straight line
-    p1 = paths("you", "out")
+    p1 = counter.paths("you", "out")
 
-    # PART 2: The "Acyclic Multiplication" logic
-    # In a DAG, only one of these two routes can physically exist.
-    # The other will automatically result in 0.
-    p2 = paths("svr", "dac") * paths("dac", "fft") * paths("fft", "out") + paths(
-        "svr", "fft"
-    ) * paths("fft", "dac") * paths("dac", "out")
+    # PART 2: Through both "dac" and "fft", in whichever order the DAG allows
+    p2 = counter.paths_through("svr", "out", ["dac", "fft"])
 
     print(f"Part 1 Answer: {p1}")
     print(f"Part 2 Answer: {p2}")
 
 
 if __name__ == "__main__":
-    # Standard practice for deep graph recursionn
-    sys.setrecursionlimit(10000)
     solve()